@@ -0,0 +1,168 @@
+"""Micro-benchmarks for the signer lookup hot path and the caches in utilities/.
+
+The signer lookup benchmarks call get_oci_signer_async from server.py, imported
+against a fake IAM domain served in-process on --iam-port, with the token exchange
+replaced by one that sleeps --exchange-ms instead of calling IAM.
+
+Run from the repository root:
+    python -m benchmarks.bench_caches --iterations 20000
+    python -m benchmarks.bench_caches --redis-url redis://localhost:6379
+"""
+import argparse
+import asyncio
+import contextvars
+import os
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from benchmarks.common import print_table, summarize, time_async_calls, time_calls
+from benchmarks.fake_iam import FakeIAM
+from utilities.clientpool import OCIClientPool
+from utilities.diskcache import DiskCache
+from utilities.ttlcache import TTLCache
+
+
+class FakeSigner:
+    """Just enough of a security token signer for utilities.upst to serialize"""
+
+    def __init__(self):
+        self.api_key = "ST$" + "header.eyJleHAiOjQxMDI0NDQ4MDB9.signature"
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class FakeClient:
+    def __init__(self, config, signer):
+        self.region = config["region"]
+
+
+def bench_ttlcache(iterations: int) -> list[dict]:
+    cache = TTLCache(max_size=iterations)
+    keys = [uuid.uuid4().hex for _ in range(1024)]
+    for key in keys:
+        cache.set(key, object(), expires_at=time.time() + 3600)
+    counter = iter(range(10**9))
+    return [
+        summarize("ttlcache.get hit", time_calls(lambda: cache.get(keys[next(counter) % 1024]), iterations)),
+        summarize("ttlcache.get miss", time_calls(lambda: cache.get("missing"), iterations)),
+        summarize("ttlcache.set", time_calls(lambda: cache.set(next(counter), 1, expires_at=time.time() + 60), iterations)),
+    ]
+
+
+def bench_clientpool(iterations: int) -> list[dict]:
+    pool = OCIClientPool(max_size=64)
+    signer = object()
+    pool.get(FakeClient, signer, "us-ashburn-1")
+    return [summarize("clientpool.get hit", time_calls(lambda: pool.get(FakeClient, signer, "us-ashburn-1"), iterations))]
+
+
+def bench_diskcache(iterations: int) -> list[dict]:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskCache(cache_dir=cache_dir, sweep_interval=0)
+        value = {"token": "x" * 1500, "private_key": "y" * 1700, "exp": time.time() + 3600}
+        counter = iter(range(10**9))
+        rows = [summarize("diskcache.set", time_calls(lambda: cache.set(f"k{next(counter) % 1000}", value), iterations))]
+        rows.append(summarize("diskcache.get hit", time_calls(lambda: cache.get(f"k{next(counter) % 1000}"), iterations)))
+        rows.append(summarize("diskcache.get miss", time_calls(lambda: cache.get("missing"), iterations)))
+        cache.close()
+    return rows
+
+
+def _import_server(iam_port: int, l1_size: int):
+    """Import server.py against an in-process fake IAM domain (it loads OIDC discovery at import)"""
+    url = f"http://127.0.0.1:{iam_port}"
+    FakeIAM(url).serve_in_thread(port=iam_port)
+    os.environ.update({
+        "IDCS_URL": url,
+        "IDCS_CLIENT_ID": "fake-client",
+        "IDCS_CLIENT_SECRET": "fake-secret",
+        "JWT_SIGNING_KEY": "bench-signing-key",
+        "LOG_LEVEL": "WARNING",
+        "SIGNER_CACHE_MAX_SIZE": str(l1_size),
+    })
+    import server
+
+    return server
+
+
+async def bench_signer_lookup(iterations: int, exchange_ms: float, iam_port: int) -> list[dict]:
+    misses = max(1, min(iterations, 200))
+    server = _import_server(iam_port, l1_size=misses + 16)
+    signer = FakeSigner()
+
+    def exchange(token):
+        time.sleep(exchange_ms / 1000)
+        return signer
+
+    # Only the IAM round trip is faked; caching, single-flight, admission and the executor are the server's
+    server._create_signer = exchange
+    caller = contextvars.ContextVar("bench_caller")
+    server.get_access_token = caller.get
+
+    def access_token(tokenID):
+        return SimpleNamespace(token=f"token-{tokenID}", claims={"jti": tokenID, "exp": time.time() + 3600})
+
+    async def lookup(token):
+        caller.set(token)
+        return await server.get_oci_signer_async()
+
+    warm = access_token("warm")
+    await lookup(warm)
+    rows = [summarize("get_oci_signer_async warm hit", await time_async_calls(lambda: lookup(warm), iterations))]
+
+    rows.append(summarize(
+        "get_oci_signer_async cold miss",
+        await time_async_calls(lambda: lookup(access_token(uuid.uuid4().hex)), misses),
+    ))
+
+    # Many concurrent tool calls on one fresh token share a single exchange
+    fan_in = 50
+    fresh = access_token("fresh")
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(fresh) for _ in range(fan_in)))
+    elapsed = time.perf_counter() - start
+    rows.append(summarize(f"get_oci_signer_async {fan_in} concurrent misses", [elapsed], elapsed))
+    print(f"single-flight: {server._signer_flight.stats()}")
+    return rows
+
+
+async def bench_redis(iterations: int, redis_url: str) -> list[dict]:
+    from utilities.rediscache import AsyncRedisTokenCache
+
+    cache = AsyncRedisTokenCache(redis_url=redis_url)
+    signer = FakeSigner()
+    await cache.set("bench", signer)
+    rows = [
+        summarize("redis.set", await time_async_calls(lambda: cache.set("bench", signer), iterations)),
+        summarize("redis.get hit", await time_async_calls(lambda: cache.get("bench"), iterations)),
+    ]
+    tokenIDs = [f"bench{i}" for i in range(100)]
+    await cache.set_many({tokenID: signer for tokenID in tokenIDs})
+    rows.append(summarize("redis.get_many x100", await time_async_calls(lambda: cache.get_many(tokenIDs), max(1, iterations // 100))))
+    await cache.redis_client.delete(*[f"mcp:token:{tokenID}" for tokenID in tokenIDs + ["bench"]])
+    await cache.aclose()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--exchange-ms", type=float, default=50.0, help="simulated token exchange latency")
+    parser.add_argument("--iam-port", type=int, default=9100, help="port of the in-process fake IAM domain")
+    parser.add_argument("--redis-url", default=None, help="also benchmark AsyncRedisTokenCache")
+    args = parser.parse_args()
+
+    rows = bench_ttlcache(args.iterations)
+    rows += bench_clientpool(args.iterations)
+    rows += bench_diskcache(min(args.iterations, 2000))
+    rows += asyncio.run(bench_signer_lookup(args.iterations, args.exchange_ms, args.iam_port))
+    if args.redis_url:
+        rows += asyncio.run(bench_redis(min(args.iterations, 2000), args.redis_url))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark the per-call cost of logging on the signer cache hit path.
+
+Each scenario times the cache-hit branch of get_oci_signer_async (TTLCache lookup plus the
+debug log line) with a different logging setup. Output goes to os.devnull so the
+numbers show the cost paid by the calling thread, not terminal speed:
+
+- disabled: queue pipeline configured at INFO, the debug line is filtered out
+- sync_fstring: the previous style, an f-string with the signer repr written by a
+  plain StreamHandler on the calling thread
+- queue_json: queue pipeline at DEBUG with JSON output and no rate limit
+- queue_json_rate_limited: as above with the default rate limit of 10/s per message
+
+Run from the repository root:
+    python -m benchmarks.bench_logging --iterations 50000
+"""
+import argparse
+import logging
+import os
+
+from benchmarks.common import print_table, summarize, time_calls
+from utilities.logpipeline import configure_logging, jti_var, shutdown_logging
+from utilities.ttlcache import TTLCache
+
+LOGGER_NAME = "fastmcp.bench"
+
+
+class FakeSigner:
+    def __repr__(self):
+        return "<TokenExchangeSigner api_key=ST$...>"
+
+
+def run(iterations: int) -> list[dict]:
+    logger = logging.getLogger(LOGGER_NAME)
+    cache = TTLCache(max_size=1024)
+    tokenID = "bench-jti"
+    cache.set(tokenID, FakeSigner())
+    jti_var.set(tokenID)
+    devnull = open(os.devnull, "w")
+
+    def lookup():
+        signer = cache.get(tokenID)
+        if signer:
+            logger.debug("Using cached signer for token ID %s", tokenID)
+            return signer
+
+    def lookup_fstring():
+        signer = cache.get(tokenID)
+        logger.debug(f"Global cached signer: {signer}")
+        if signer:
+            logger.debug(f"Using globally cached signer for token ID: {tokenID}")
+            return signer
+
+    rows = []
+    scenarios = [
+        ("disabled", lookup, dict(level="INFO", rate_limit=0)),
+        ("sync_fstring", lookup_fstring, None),
+        ("queue_json", lookup, dict(level="DEBUG", rate_limit=0)),
+        ("queue_json_rate_limited", lookup, dict(level="DEBUG", rate_limit=10)),
+    ]
+    for name, fn, options in scenarios:
+        if options is None:
+            shutdown_logging()
+            handler = logging.StreamHandler(devnull)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+            logger.handlers = [handler]
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+        else:
+            configure_logging(stream=devnull, logger_name=LOGGER_NAME, **options)
+        fn()
+        rows.append(summarize(name, time_calls(fn, iterations)))
+    shutdown_logging()
+    devnull.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+    print_table(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
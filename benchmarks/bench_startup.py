@@ -0,0 +1,80 @@
+"""Startup benchmark: time from process start to first /health, /ready and first tool call.
+
+Starts the server entry point as a subprocess (as `python server.py` would) --runs
+times and polls it. The first tool call needs a bearer token (--token or MCP_TOKEN);
+without one only the /health and /ready timings are reported. The entry point reads
+its IAM domain settings from .env as usual.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --entry server.py --runs 5 --token $MCP_TOKEN
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from fastmcp import Client
+
+
+async def wait_for(client: httpx.AsyncClient, url: str, start: float, timeout: float) -> float | None:
+    """Poll url until it returns 200 and return the seconds elapsed since start"""
+    while time.perf_counter() - start < timeout:
+        try:
+            response = await client.get(url)
+            if response.status_code == 200:
+                return time.perf_counter() - start
+            if response.status_code == 404:
+                return None
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.01)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+async def run_once(args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    token = args.token or os.getenv("MCP_TOKEN")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, args.entry], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            timings = {"health": await wait_for(client, f"{base_url}/health", start, args.timeout)}
+            timings["ready"] = await wait_for(client, f"{base_url}/ready", start, args.timeout)
+        timings["first_tool"] = None
+        if token:
+            async with Client(f"{base_url}/mcp/", auth=token) as mcp_client:
+                await mcp_client.call_tool(args.tool, {})
+            timings["first_tool"] = time.perf_counter() - start
+        return timings
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entry", default="server.py")
+    parser.add_argument("--port", type=int, default=8000, help="port the entry point listens on")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--tool", default="whoami", help="tool without arguments used for the first call")
+    parser.add_argument("--token", default=None, help="bearer token for the MCP server")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_once(args)) for _ in range(args.runs)]
+    print(f"{'stage':<12} {'mean_ms':>12} {'min_ms':>12} {'max_ms':>12}")
+    for stage in ("health", "ready", "first_tool"):
+        samples = [r[stage] for r in results if r[stage] is not None]
+        if not samples:
+            print(f"{stage:<12} {'n/a':>12}")
+            continue
+        print(f"{stage:<12} {statistics.fmean(samples) * 1000:>12.1f} "
+              f"{min(samples) * 1000:>12.1f} {max(samples) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
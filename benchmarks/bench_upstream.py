@@ -0,0 +1,89 @@
+"""Benchmark IAM domain requests with a fresh client per request vs the shared pool.
+
+Sends discovery, JWKS and refresh_token requests to a running IAM domain (normally
+benchmarks.fake_iam) twice: once with a new httpx.AsyncClient per request, which is
+what OAuthProxy does for its token requests, and once through an UpstreamPool like
+OCIProvider's. The storm scenarios send --concurrency token requests at once, as after
+a deploy when every client logs in again. Against an https:// URL the difference
+includes the TLS handshakes. The pool's per-endpoint stats are printed at the end.
+
+Run from the repository root, with the fake IAM domain running:
+    python -m benchmarks.fake_iam --port 9000 --latency-ms 20
+    python -m benchmarks.bench_upstream --url http://127.0.0.1:9000 --iterations 200
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import print_table, summarize, time_async_calls
+from utilities.httppool import UpstreamPool
+
+TOKEN_FORM = {"grant_type": "refresh_token", "refresh_token": "bench", "client_id": "bench-client"}
+
+
+async def _storm(send, concurrency: int) -> tuple[list[float], float]:
+    async def timed():
+        start = time.perf_counter()
+        await send()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(timed() for _ in range(concurrency)))
+    return list(samples), time.perf_counter() - start
+
+
+async def run(url: str, iterations: int, concurrency: int, http2: bool) -> tuple[list[dict], dict]:
+    url = url.rstrip("/")
+    endpoints = {
+        "discovery": ("GET", f"{url}/.well-known/openid-configuration", None),
+        "jwks": ("GET", f"{url}/admin/v1/SigningCert/jwk", None),
+        "token": ("POST", f"{url}/oauth2/v1/token", TOKEN_FORM),
+    }
+    pool = UpstreamPool(max_connections=max(100, concurrency), http2=http2)
+
+    def fresh(method, target, form):
+        async def send():
+            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0)) as client:
+                (await client.request(method, target, data=form)).raise_for_status()
+        return send
+
+    def pooled(method, target, form):
+        async def send():
+            (await pool.client.request(method, target, data=form)).raise_for_status()
+        return send
+
+    rows = []
+    try:
+        for name, (method, target, form) in endpoints.items():
+            for mode, make in (("fresh", fresh), ("pooled", pooled)):
+                send = make(method, target, form)
+                await send()
+                rows.append(summarize(f"{name} {mode}", await time_async_calls(send, iterations)))
+        method, target, form = endpoints["token"]
+        for mode, make in (("fresh", fresh), ("pooled", pooled)):
+            samples, elapsed = await _storm(make(method, target, form), concurrency)
+            rows.append(summarize(f"token storm x{concurrency} {mode}", samples, elapsed))
+        return rows, pool.stats()
+    finally:
+        await pool.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:9000")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--http2", action="store_true")
+    args = parser.parse_args()
+    rows, stats = asyncio.run(run(args.url, args.iterations, args.concurrency, args.http2))
+    print_table(rows)
+    print()
+    for path, entry in stats.items():
+        print(f"{path}: {entry['requests']} requests, {entry['errors']} errors, "
+              f"avg {entry['avg'] * 1000:.2f} ms, max {entry['max'] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark access token verification with and without the verified-token cache.
+
+Signs a token with the fake IAM domain's key and verifies it repeatedly with
+OCIJWTVerifier, once with the cache disabled and once enabled.
+
+Run from the repository root:
+    python -m benchmarks.bench_verify --iterations 5000
+"""
+import argparse
+import asyncio
+
+from cryptography.hazmat.primitives import serialization
+
+from benchmarks.common import print_table, summarize, time_async_calls
+from benchmarks.fake_iam import FakeIAM
+from ociprovider import OCIJWTVerifier
+
+
+async def run(iterations: int) -> list[dict]:
+    fake = FakeIAM("http://127.0.0.1:9000")
+    private_key = serialization.load_pem_private_key(fake.private_pem, password=None)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    token = fake.issue("bench-user", "bench-client")
+
+    rows = []
+    for cache_size in (0, 1024):
+        verifier = OCIJWTVerifier(
+            public_key=public_pem,
+            issuer=fake.base_url,
+            audience="bench-client",
+            algorithm="RS256",
+            token_cache_size=cache_size,
+        )
+        assert await verifier.load_access_token(token) is not None
+        samples = await time_async_calls(lambda: verifier.load_access_token(token), iterations)
+        label = "verify cached" if cache_size else "verify uncached"
+        rows.append(summarize(label, samples))
+        if cache_size:
+            print(f"verified-token cache: {verifier.token_cache_stats()}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.iterations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Timing helpers shared by the benchmark scripts."""
+import statistics
+import time
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, samples: list[float], elapsed: float | None = None) -> dict:
+    """Latency percentiles (ms) and throughput for a list of per-call durations in seconds"""
+    elapsed = elapsed if elapsed is not None else sum(samples)
+    return {
+        "name": name,
+        "calls": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "throughput_per_s": len(samples) / elapsed if elapsed else 0.0,
+    }
+
+
+def print_table(rows: list[dict]):
+    """Print summaries as an aligned table"""
+    columns = ["name", "calls", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "throughput_per_s"]
+    width = max([len(r["name"]) for r in rows] + [4])
+    print(f"{'name':<{width}} " + " ".join(f"{c:>16}" for c in columns[1:]))
+    for row in rows:
+        cells = [f"{row[c]:>16.4f}" if isinstance(row[c], float) else f"{row[c]:>16}" for c in columns[1:]]
+        print(f"{row['name']:<{width}} " + " ".join(cells))
+
+
+def time_calls(fn, iterations: int) -> list[float]:
+    """Time iterations calls of fn()"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def time_async_calls(fn, iterations: int) -> list[float]:
+    """Time iterations awaits of fn()"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return samples
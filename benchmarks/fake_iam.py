@@ -0,0 +1,190 @@
+"""Local stand-in for an OCI IAM domain and Object Storage, for benchmarks.
+
+Serves OIDC discovery, JWKS, an authorization endpoint that approves immediately,
+a token endpoint (authorization_code, refresh_token and the OCI token exchange
+grant), token revocation and Object Storage's get_namespace. Tokens are RS256 JWTs
+signed with a key generated at startup. --latency-ms adds an artificial delay to
+every response to mimic a remote IAM domain.
+
+Run from the repository root:
+    python -m benchmarks.fake_iam --port 9000 --latency-ms 50
+
+and point a server at it (token exchange with a URL needs an OCI SDK that accepts
+oci_domain_url):
+    IDCS_URL=http://127.0.0.1:9000 OCI_SERVICE_ENDPOINT=http://127.0.0.1:9000 \
+    OAUTH_REQUIRE_CONSENT=false IDCS_CLIENT_ID=fake-client IDCS_CLIENT_SECRET=fake-secret \
+    python server.py
+"""
+import argparse
+import asyncio
+import secrets
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+
+import uvicorn
+from authlib.jose import JsonWebKey, jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse
+from starlette.routing import Route
+
+TOKEN_EXCHANGE_GRANT = "urn:ietf:params:oauth:grant-type:token-exchange"
+
+
+class FakeIAM:
+    """Holds the signing key and issued codes for the fake IAM domain"""
+
+    def __init__(self, base_url: str, latency: float = 0.0, token_lifetime: int = 3600):
+        self.base_url = base_url.rstrip("/")
+        self.latency = latency
+        self.token_lifetime = token_lifetime
+        self.kid = uuid.uuid4().hex
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.jwk = {**JsonWebKey.import_key(public_pem, {"kty": "RSA"}).as_dict(), "kid": self.kid, "use": "sig"}
+        self.codes: dict[str, dict] = {}
+        self.requests: dict[str, int] = {}
+
+    def issue(self, sub: str, client_id: str, scope: str = "openid profile email", **claims) -> str:
+        """Sign a JWT for sub"""
+        now = int(time.time())
+        payload = {
+            "iss": self.base_url,
+            "sub": sub,
+            "uid": sub,
+            "aud": client_id,
+            "client_id": client_id,
+            "scope": scope,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": now + self.token_lifetime,
+            **claims,
+        }
+        return jwt.encode({"alg": "RS256", "kid": self.kid}, payload, self.private_pem).decode()
+
+    async def _delay(self, name: str):
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def discovery(self, request: Request):
+        await self._delay("discovery")
+        return JSONResponse({
+            "issuer": self.base_url,
+            "authorization_endpoint": f"{self.base_url}/oauth2/v1/authorize",
+            "token_endpoint": f"{self.base_url}/oauth2/v1/token",
+            "jwks_uri": f"{self.base_url}/admin/v1/SigningCert/jwk",
+            "userinfo_endpoint": f"{self.base_url}/oauth2/v1/userinfo",
+            "revocation_endpoint": f"{self.base_url}/oauth2/v1/revoke",
+            "response_types_supported": ["code"],
+            "subject_types_supported": ["public"],
+            "id_token_signing_alg_values_supported": ["RS256"],
+            "scopes_supported": ["openid", "profile", "email"],
+            "grant_types_supported": ["authorization_code", "refresh_token", TOKEN_EXCHANGE_GRANT],
+            "token_endpoint_auth_methods_supported": ["client_secret_basic", "client_secret_post"],
+            "code_challenge_methods_supported": ["S256"],
+        })
+
+    async def jwks(self, request: Request):
+        await self._delay("jwks")
+        return JSONResponse({"keys": [self.jwk]})
+
+    async def authorize(self, request: Request):
+        await self._delay("authorize")
+        params = request.query_params
+        code = secrets.token_urlsafe(16)
+        self.codes[code] = {"client_id": params.get("client_id"), "scope": params.get("scope", "openid")}
+        query = {"code": code}
+        if "state" in params:
+            query["state"] = params["state"]
+        return RedirectResponse(f"{params['redirect_uri']}?{urlencode(query)}", status_code=302)
+
+    async def token(self, request: Request):
+        await self._delay("token")
+        form = await request.form()
+        grant_type = form.get("grant_type")
+        client_id = form.get("client_id") or "fake-client"
+        if grant_type == "authorization_code":
+            issued = self.codes.pop(form.get("code"), None)
+            if issued is None:
+                return JSONResponse({"error": "invalid_grant"}, status_code=400)
+            scope = issued["scope"]
+        elif grant_type == "refresh_token":
+            scope = form.get("scope", "openid profile email")
+        elif grant_type == TOKEN_EXCHANGE_GRANT:
+            # OCI token exchange: IAM JWT in, UPST out
+            upst = self.issue("fake-user", client_id, sub_type="user", tenant="ocid1.tenancy.oc1..fake",
+                              sess_exp=int(time.time()) + self.token_lifetime)
+            return JSONResponse({"token": upst})
+        else:
+            return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+        return JSONResponse({
+            "access_token": self.issue("fake-user", client_id, scope),
+            "id_token": self.issue("fake-user", client_id, scope),
+            "refresh_token": secrets.token_urlsafe(32),
+            "token_type": "Bearer",
+            "expires_in": self.token_lifetime,
+            "scope": scope,
+        })
+
+    async def revoke(self, request: Request):
+        await self._delay("revoke")
+        return JSONResponse({})
+
+    async def userinfo(self, request: Request):
+        await self._delay("userinfo")
+        return JSONResponse({"sub": "fake-user", "email": "fake-user@example.com"})
+
+    async def get_namespace(self, request: Request):
+        await self._delay("get_namespace")
+        return JSONResponse("fakenamespace")
+
+    async def stats(self, request: Request):
+        return JSONResponse(self.requests)
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/.well-known/openid-configuration", self.discovery),
+            Route("/admin/v1/SigningCert/jwk", self.jwks),
+            Route("/oauth2/v1/authorize", self.authorize),
+            Route("/oauth2/v1/token", self.token, methods=["POST"]),
+            Route("/oauth2/v1/revoke", self.revoke, methods=["POST"]),
+            Route("/oauth2/v1/userinfo", self.userinfo),
+            Route("/n/", self.get_namespace),
+            Route("/stats", self.stats),
+        ])
+
+    def serve_in_thread(self, host: str = "127.0.0.1", port: int = 9000) -> uvicorn.Server:
+        """Serve the fake domain from a daemon thread, e.g. so a benchmark can import a server
+        module (which loads OIDC discovery at import). Set should_exit on the result to stop it."""
+        server = uvicorn.Server(uvicorn.Config(self.app(), host=host, port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, name="fake-iam", daemon=True)
+        thread.start()
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError(f"Fake IAM domain could not listen on {host}:{port}")
+            time.sleep(0.01)
+        return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeIAM(f"http://{args.host}:{args.port}", latency=args.latency_ms / 1000)
+    uvicorn.run(fake.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Import-time profile of the server entry points, OCIProvider and the utilities caches.
+
+Each module is imported in a fresh interpreter with -X importtime. The report lists
+the total import time per module (best of --runs) and, with --top, the heaviest
+packages it pulls in. server and ociserverusingprovider load OIDC discovery at import,
+so they need the .env configuration of a reachable IAM domain.
+
+Run from the repository root:
+    python -m benchmarks.import_profile --runs 3 --top 10
+"""
+import argparse
+import subprocess
+import sys
+
+MODULES = [
+    "utilities.ttlcache",
+    "utilities.singleflight",
+    "utilities.clientpool",
+    "utilities.ociexecutor",
+    "utilities.diskcache",
+    "utilities.metrics",
+    "utilities.responsecache",
+    "utilities.tieredcache",
+    "utilities.keyvalue",
+    "utilities.rediscache",
+    "utilities.upst",
+    "ociprovider",
+    "oci",
+    "server",
+    "ociserverusingprovider",
+]
+
+
+def profile(module: str | None) -> tuple[dict[str, int] | None, str]:
+    """Import module in a fresh interpreter and return (cumulative us per package, error).
+    With module=None only the interpreter startup imports are reported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        package = name.strip()
+        # Keep the largest figure when a package shows up at several depths
+        cumulative[package] = max(cumulative.get(package, 0), int(cumulative_us))
+    return cumulative, ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default=",".join(MODULES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0, help="also list the N heaviest imports per module")
+    args = parser.parse_args()
+
+    modules = args.modules.split(",")
+    # Imports done by interpreter startup (site, encodings, ...) are not the module's cost
+    startup = set(profile(None)[0] or ())
+    width = max(len(m) for m in modules)
+    print(f"{'module':<{width}} {'import_ms':>12}")
+    for module in modules:
+        best, error = None, ""
+        for _ in range(args.runs):
+            cumulative, error = profile(module)
+            if cumulative is None:
+                break
+            if best is None or cumulative.get(module, 0) < best.get(module, 0):
+                best = cumulative
+        if best is None:
+            print(f"{module:<{width}} {'error':>12}  {error}")
+            continue
+        print(f"{module:<{width}} {best.get(module, 0) / 1000:>12.1f}")
+        if args.top:
+            heaviest = sorted(
+                ((us, name) for name, us in best.items() if name != module and "." not in name and name not in startup),
+                reverse=True,
+            )[: args.top]
+            for us, name in heaviest:
+                print(f"{'  ' + name:<{width}} {us / 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
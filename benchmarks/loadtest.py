@@ -0,0 +1,124 @@
+"""Concurrent multi-client load driver for the MCP server tools.
+
+Each worker opens its own fastmcp.Client session (like client.py) and calls the
+selected tools in a loop. Latency percentiles and throughput are reported per tool.
+
+The server must already be running. Pass a bearer token with --token (or MCP_TOKEN)
+to skip the interactive OAuth flow, or --auth oauth to log in through the browser once
+per worker. --auth headless logs every worker in without a browser by following the
+redirects of an IAM domain that approves immediately, such as benchmarks.fake_iam
+with the server started with OAUTH_REQUIRE_CONSENT=false.
+
+Run from the repository root:
+    python -m benchmarks.loadtest --url http://localhost:8000/mcp/ --concurrency 32 --calls 2000
+    python -m benchmarks.loadtest --auth headless --concurrency 8 --calls 500
+"""
+import argparse
+import asyncio
+import os
+import time
+import warnings
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import httpx
+from fastmcp import Client
+from fastmcp.client.auth import OAuth
+
+from benchmarks.common import print_table, summarize
+
+TOOLS = {
+    "whoami": {},
+    "get_access_token_claims": {},
+    "get_os_namespace": None,  # needs region
+}
+
+
+class HeadlessOAuth(OAuth):
+    """OAuth login that follows the authorization redirects itself instead of opening a browser.
+    Only works when no page along the way waits for a user, e.g. against benchmarks.fake_iam."""
+
+    async def redirect_handler(self, authorization_url: str) -> None:
+        callback = f"http://localhost:{self.redirect_port}/callback"
+        url = authorization_url
+        async with httpx.AsyncClient() as client:
+            for _ in range(10):
+                location = (await client.get(url)).headers.get("location")
+                if location is None:
+                    raise RuntimeError(f"Login stopped at {url} without redirecting back")
+                url = urljoin(url, location)
+                if url.startswith(callback):
+                    break
+        query = parse_qs(urlsplit(url).query)
+        if "code" not in query:
+            raise RuntimeError(f"Login failed: {query.get('error', query)}")
+        self._callback_result = (query["code"][0], query.get("state", [None])[0])
+
+    async def callback_handler(self) -> tuple[str, str | None]:
+        return self._callback_result
+
+
+def _auth_for(url: str, auth):
+    if auth != "headless":
+        return auth
+    with warnings.catch_warnings():
+        # Each worker keeps its tokens in memory for the length of the run
+        warnings.simplefilter("ignore")
+        return HeadlessOAuth(url)
+
+
+async def worker(url: str, auth, plan: asyncio.Queue, samples: dict, errors: dict):
+    async with Client(url, auth=_auth_for(url, auth)) as client:
+        while True:
+            try:
+                tool, arguments = plan.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                await client.call_tool(tool, arguments)
+            except Exception:
+                errors[tool] = errors.get(tool, 0) + 1
+                continue
+            samples[tool].append(time.perf_counter() - start)
+
+
+async def run(args) -> list[dict]:
+    tools = args.tools.split(",")
+    arguments = {tool: TOOLS.get(tool) or {} for tool in tools}
+    if "get_os_namespace" in arguments:
+        arguments["get_os_namespace"] = {"region": args.region}
+
+    plan = asyncio.Queue()
+    for i in range(args.calls):
+        tool = tools[i % len(tools)]
+        plan.put_nowait((tool, arguments[tool]))
+
+    auth = args.token or os.getenv("MCP_TOKEN") or args.auth
+    samples = {tool: [] for tool in tools}
+    errors: dict[str, int] = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.url, auth, plan, samples, errors) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    rows = [summarize(tool, samples[tool], elapsed) for tool in tools]
+    rows.append(summarize("all", [s for tool in tools for s in samples[tool]], elapsed))
+    if errors:
+        print(f"errors: {errors}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/mcp/")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=1000, help="total tool calls across all workers")
+    parser.add_argument("--tools", default="whoami,get_access_token_claims,get_os_namespace")
+    parser.add_argument("--region", default="us-ashburn-1")
+    parser.add_argument("--token", default=None, help="bearer token for the MCP server")
+    parser.add_argument("--auth", default="oauth", help="auth mode when no token is given: oauth or headless")
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
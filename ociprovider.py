@@ -32,39 +32,48 @@ Example:
     
         #Check if the signer exists for the token ID in memory cache
         cached_signer = _global_token_cache.get(tokenID)
-        logger.debug(f"Global cached signer: {cached_signer}")
         if cached_signer:
-            logger.debug(f"Using globally cached signer for token ID: {tokenID}")
+            logger.debug("Using cached signer for token ID %s", tokenID)
             return cached_signer
 
         #If the signer is not yet created for the token then create new OCI signer object
-        logger.debug(f"Creating new signer for token ID: {tokenID}")
+        logger.debug("Creating new signer for token ID %s", tokenID)
         signer = TokenExchangeSigner(
             jwt_or_func=token,
             oci_domain_id=IAM_GUID,
             client_id=IAM_TOKENEXCHANGE_CLIENT_ID,
             client_secret=IAM_TOKENEXCHANGE_CLIENT_SECRET
         )
-        logger.debug(f"Signer {signer} created for token ID: {tokenID}")
-        
+
         #Cache the signer object in memory cache
         _global_token_cache[tokenID] = signer
-        logger.debug(f"Signer cached for token ID: {tokenID}")
+        logger.debug("Signer cached for token ID %s", tokenID)
 
         return signer
 
     mcp = FastMCP("My Protected Server", auth=auth)
     ```
 """
+import asyncio
+import hashlib
+import time
+
+import httpx
+from authlib.jose import JsonWebKey
 from key_value.aio.protocols import AsyncKeyValue
 from pydantic import AnyHttpUrl, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from fastmcp.server.auth.oidc_proxy import OIDCProxy
+from fastmcp.server.auth.oidc_proxy import OIDCConfiguration, OIDCProxy
+from fastmcp.server.auth.providers.jwt import JWTVerifier
 from fastmcp.settings import ENV_FILE
 from fastmcp.utilities.auth import parse_scopes
 from fastmcp.utilities.logging import get_logger
 from fastmcp.utilities.types import NotSet, NotSetT
+from utilities.diskcache import DiskCache
+from utilities.httppool import UpstreamPool
+from utilities.metrics import STAGE_SECONDS
+from utilities.ttlcache import TTLCache
 
 logger = get_logger(__name__)
 
@@ -88,6 +97,13 @@ class OCIProviderSettings(BaseSettings):
     required_scopes: list[str] | None = None
     allowed_client_redirect_uris: list[str] | None = None
     jwt_signing_key: str | None = None
+    cache_dir: str | None = None
+    jwks_refresh_interval: int = 3600
+    verified_token_cache_size: int = 0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2: bool = False
 
     @field_validator("required_scopes", mode="before")
     @classmethod
@@ -95,6 +111,196 @@ class OCIProviderSettings(BaseSettings):
         return parse_scopes(v)
 
 
+class OCIJWTVerifier(JWTVerifier):
+    """JWT verifier that keeps the IAM domain's JWKS in a persistent cache.
+
+    Keys are loaded from the cache at startup, so token validation does not wait on the
+    IAM domain after a restart, and keep working through a short IAM outage. Cached keys
+    are refetched in the background right after startup, so a rotated or revoked key
+    stops validating tokens, and the JWKS (and discovery document) are refreshed every
+    refresh_interval seconds after that. A token with an unknown kid triggers an immediate refetch, at most once
+    every min_refetch_interval seconds.
+
+    With token_cache_size > 0, verified access tokens are cached by SHA-256 digest of
+    the raw token until their exp, so a client reusing the same bearer token skips the
+    RSA signature check and claim parsing on every request.
+
+    JWKS and discovery fetches go through http_client when given, otherwise through a
+    short-lived client per fetch.
+    """
+
+    def __init__(
+        self,
+        *,
+        store=None,
+        config_url: str | None = None,
+        refresh_interval: int = 3600,
+        min_refetch_interval: int = 30,
+        token_cache_size: int = 0,
+        token_cache_default_ttl: int = 300,
+        http_client: httpx.AsyncClient | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._verified_tokens = None
+        if token_cache_size > 0:
+            self._verified_tokens = TTLCache(max_size=token_cache_size, default_ttl=token_cache_default_ttl)
+        self._store = store
+        self._http_client = http_client
+        self._oci_config_url = config_url
+        self._refresh_interval = refresh_interval
+        self._min_refetch_interval = min_refetch_interval
+        self._keys: dict[str, object] = {}
+        self._last_fetch = 0.0
+        self._fetch_lock: asyncio.Lock | None = None
+        self._refresh_task: asyncio.Task | None = None
+        # Keys read from the persistent cache may be stale (a rotated or revoked key), so the
+        # background refresh fetches them right away instead of after refresh_interval
+        self._refresh_now = False
+        if store is not None:
+            cached = store.get(_jwks_cache_key(self.jwks_uri))
+            if cached:
+                self._load_keys(cached)
+                self._refresh_now = True
+                logger.debug("Loaded %d signing keys from JWKS cache", len(self._keys))
+
+    def _load_keys(self, jwks_data: dict):
+        keys = {}
+        for key_data in jwks_data.get("keys", []):
+            jwk = JsonWebKey.import_key(key_data)
+            keys[key_data.get("kid") or "_default"] = jwk.get_public_key()
+        self._keys = keys
+
+    async def _http_get(self, url: str) -> dict:
+        if self._http_client is not None:
+            response = await self._http_client.get(url)
+            response.raise_for_status()
+            return response.json()
+        async with httpx.AsyncClient(timeout=httpx.Timeout(10.0)) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+
+    async def refresh_keys(self, min_interval: float = 0):
+        """Fetch the JWKS from the IAM domain and persist it.
+        Skipped when the last fetch is less than min_interval seconds old, checked under the
+        fetch lock so callers queued behind a fetch don't repeat it."""
+        if self._fetch_lock is None:
+            self._fetch_lock = asyncio.Lock()
+        async with self._fetch_lock:
+            if min_interval and time.monotonic() - self._last_fetch < min_interval:
+                return
+            jwks_data = await self._http_get(self.jwks_uri)
+            self._load_keys(jwks_data)
+            self._last_fetch = time.monotonic()
+            if self._store is not None:
+                await self._store.aset(_jwks_cache_key(self.jwks_uri), jwks_data)
+
+    async def _refresh_discovery(self):
+        if self._store is None or not self._oci_config_url:
+            return
+        config = await self._http_get(self._oci_config_url)
+        await self._store.aset(_discovery_cache_key(self._oci_config_url), config)
+
+    async def _refresh_loop(self, delay: float):
+        while True:
+            await asyncio.sleep(delay)
+            delay = self._refresh_interval
+            try:
+                await self.refresh_keys()
+                await self._refresh_discovery()
+            except Exception as e:
+                # Keep serving the keys we have, try again on the next interval
+                logger.warning("Background JWKS refresh failed: %s", e)
+
+    def _ensure_refresh_task(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            delay = 0 if self._refresh_now else self._refresh_interval
+            self._refresh_now = False
+            self._refresh_task = asyncio.create_task(self._refresh_loop(delay))
+
+    async def _get_jwks_key(self, kid: str | None):
+        """Return the verification key for kid, refetching the JWKS on an unknown kid"""
+        self._ensure_refresh_task()
+        key = self._lookup_key(kid)
+        if key is not None:
+            return key
+
+        if time.monotonic() - self._last_fetch >= self._min_refetch_interval:
+            try:
+                await self.refresh_keys(min_interval=self._min_refetch_interval)
+            except Exception as e:
+                logger.warning("JWKS fetch failed: %s", e)
+            key = self._lookup_key(kid)
+            if key is not None:
+                return key
+
+        if kid:
+            raise ValueError(f"Key ID '{kid}' not found in JWKS")
+        raise ValueError("No key ID in token and JWKS does not have exactly one key")
+
+    async def load_access_token(self, token: str):
+        """Verify the token, serving repeat verifications from the verified-token cache"""
+        with STAGE_SECONDS.time(stage="jwt_validation"):
+            return await self._load_access_token(token)
+
+    async def _load_access_token(self, token: str):
+        if self._verified_tokens is None:
+            return await super().load_access_token(token)
+
+        digest = hashlib.sha256(token.encode()).digest()
+        access_token = self._verified_tokens.get(digest)
+        if access_token is not None:
+            if access_token.expires_at is None or access_token.expires_at > time.time():
+                return access_token
+            self._verified_tokens.delete(digest)
+
+        access_token = await super().load_access_token(token)
+        if access_token is not None:
+            self._verified_tokens.set(digest, access_token, expires_at=access_token.expires_at)
+        return access_token
+
+    def token_cache_stats(self) -> dict:
+        """Return verified-token cache counters and hit rate"""
+        if self._verified_tokens is None:
+            return {}
+        stats = self._verified_tokens.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return {**stats, "hit_rate": stats["hits"] / lookups if lookups else 0.0}
+
+    def _lookup_key(self, kid: str | None):
+        if kid:
+            return self._keys.get(kid)
+        if len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        return None
+
+    async def warm_up(self) -> bool:
+        """Fetch the JWKS unless keys were loaded from the cache, and start the background refresh,
+        which refetches cached keys immediately. Returns whether signing keys are available."""
+        if not self._keys:
+            try:
+                await self.refresh_keys()
+            except Exception as e:
+                logger.warning("JWKS prefetch failed: %s", e)
+        self._ensure_refresh_task()
+        return bool(self._keys)
+
+    async def aclose(self):
+        """Stop the background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+
+def _discovery_cache_key(config_url: str) -> str:
+    return f"oidc:discovery:{config_url}"
+
+
+def _jwks_cache_key(jwks_uri: str) -> str:
+    return f"oidc:jwks:{jwks_uri}"
+
+
 class OCIProvider(OIDCProxy):
     """An OCI provider implementation for FastMCP.
 
@@ -118,6 +324,13 @@ class OCIProvider(OIDCProxy):
         client_storage: AsyncKeyValue | None = None,
         jwt_signing_key: str | bytes | NotSetT = NotSet,
         require_authorization_consent: bool = False,
+        cache_dir: str | NotSetT = NotSet,
+        jwks_refresh_interval: int | NotSetT = NotSet,
+        verified_token_cache_size: int | NotSetT = NotSet,
+        http_max_connections: int | NotSetT = NotSet,
+        http_max_keepalive_connections: int | NotSetT = NotSet,
+        http_keepalive_expiry: float | NotSetT = NotSet,
+        http2: bool | NotSetT = NotSet,
     ) -> None:
         """Initialize OCI OIDC provider.
 
@@ -132,6 +345,13 @@ class OCIProvider(OIDCProxy):
             required_scopes: Required OCI scopes (defaults to ["openid"])
             redirect_path: Redirect path configured in OCI application
             allowed_client_redirect_uris: List of allowed redirect URI patterns for MCP clients.
+            cache_dir: Directory for the persistent discovery/JWKS cache. Disabled when not set.
+            jwks_refresh_interval: Seconds between background JWKS refreshes (defaults to 3600)
+            verified_token_cache_size: Max number of verified access tokens to cache. Disabled when 0 (default).
+            http_max_connections: Max open connections to the IAM domain (defaults to 100)
+            http_max_keepalive_connections: Max idle connections kept open for reuse (defaults to 20)
+            http_keepalive_expiry: Seconds an idle connection is kept open (defaults to 30)
+            http2: Use HTTP/2 to the IAM domain, requires the h2 package (defaults to False)
         """
         settings = OCIProviderSettings.model_validate(
             {
@@ -147,6 +367,13 @@ class OCIProvider(OIDCProxy):
                     "redirect_path": redirect_path,
                     "allowed_client_redirect_uris": allowed_client_redirect_uris,
                     "jwt_signing_key": jwt_signing_key,
+                    "cache_dir": cache_dir,
+                    "jwks_refresh_interval": jwks_refresh_interval,
+                    "verified_token_cache_size": verified_token_cache_size,
+                    "http_max_connections": http_max_connections,
+                    "http_max_keepalive_connections": http_max_keepalive_connections,
+                    "http_keepalive_expiry": http_keepalive_expiry,
+                    "http2": http2,
                 }.items()
                 if v is not NotSet
             }
@@ -174,6 +401,22 @@ class OCIProvider(OIDCProxy):
 
         oci_required_scopes = settings.required_scopes or ["openid"]
 
+        # Set up before super().__init__, which loads discovery and builds the token verifier
+        self._metadata_store = None
+        if settings.cache_dir:
+            self._metadata_store = DiskCache(cache_dir=settings.cache_dir, ttl_hours=24 * 7)
+        self._jwks_refresh_interval = settings.jwks_refresh_interval
+        self._verified_token_cache_size = settings.verified_token_cache_size
+        self._oci_config_url = settings.config_url
+        self._oci_token_verifier: OCIJWTVerifier | None = None
+        # JWKS and discovery refresh requests share one keep-alive pool
+        self._upstream_pool = UpstreamPool(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            http2=settings.http2,
+        )
+
         super().__init__(
             config_url=settings.config_url,
             client_id=settings.client_id,
@@ -195,4 +438,71 @@ class OCIProvider(OIDCProxy):
             "Initialized OCI OAuth provider for client %s with scopes: %s",
             settings.client_id,
             oci_required_scopes,
-        )
\ No newline at end of file
+        )
+
+    def get_oidc_configuration(
+        self,
+        config_url: AnyHttpUrl,
+        strict: bool | None,
+        timeout_seconds: int | None,
+    ) -> OIDCConfiguration:
+        """Load the discovery document from the persistent cache, fetching it on a miss."""
+        if self._metadata_store is not None:
+            cached = self._metadata_store.get(_discovery_cache_key(str(config_url)))
+            if cached:
+                logger.debug("Loaded OIDC discovery for %s from cache", config_url)
+                return OIDCConfiguration.model_validate(cached)
+
+        oidc_config = super().get_oidc_configuration(config_url, strict, timeout_seconds)
+        if self._metadata_store is not None:
+            self._metadata_store.set(
+                _discovery_cache_key(str(config_url)),
+                oidc_config.model_dump(mode="json", exclude_none=True),
+            )
+        return oidc_config
+
+    def get_token_verifier(
+        self,
+        *,
+        algorithm: str | None = None,
+        audience: str | None = None,
+        required_scopes: list[str] | None = None,
+        timeout_seconds: int | None = None,
+    ) -> OCIJWTVerifier:
+        """Verify tokens with keys from the persistent, background-refreshed JWKS cache."""
+        self._oci_token_verifier = OCIJWTVerifier(
+            store=self._metadata_store,
+            config_url=str(self._oci_config_url) if self._oci_config_url else None,
+            refresh_interval=self._jwks_refresh_interval,
+            token_cache_size=self._verified_token_cache_size,
+            http_client=self._upstream_pool.client,
+            jwks_uri=str(self.oidc_config.jwks_uri),
+            issuer=str(self.oidc_config.issuer),
+            algorithm=algorithm,
+            audience=audience,
+            required_scopes=required_scopes,
+        )
+        return self._oci_token_verifier
+
+    async def warm_up(self) -> bool:
+        """Prefetch the signing keys used to verify access tokens.
+        The discovery document is already loaded (or read from cache_dir) at construction."""
+        if self._oci_token_verifier is None:
+            return True
+        return await self._oci_token_verifier.warm_up()
+
+    def token_cache_stats(self) -> dict:
+        """Return verified-token cache counters and hit rate, empty when the cache is disabled"""
+        if self._oci_token_verifier is None:
+            return {}
+        return self._oci_token_verifier.token_cache_stats()
+
+    def upstream_stats(self) -> dict:
+        """Return request count, errors and latency per IAM domain endpoint"""
+        return self._upstream_pool.stats()
+
+    async def aclose(self):
+        """Stop the background JWKS refresh and close the connection pool"""
+        if self._oci_token_verifier is not None:
+            await self._oci_token_verifier.aclose()
+        await self._upstream_pool.aclose()
@@ -1,27 +1,48 @@
+import asyncio
+import functools
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-import oci
-from oci.auth.signers import TokenExchangeSigner
 from ociprovider import OCIProvider
 
-from starlette.responses import PlainTextResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.requests import Request
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_access_token
 from fastmcp.server.auth import OIDCProxy
 from fastmcp.server.context import Context
 from fastmcp.utilities.logging import get_logger
+from utilities.admission import AdaptiveLimiter, AdmissionController, AdmissionGroup, CircuitBreaker
+from utilities.clientpool import OCIClientPool
+from utilities.fanout import fan_out
+from utilities.keyvalue import build_client_storage
+from utilities.lazyimport import LazyModule
+from utilities.logpipeline import LogContextMiddleware, configure_logging
+from utilities.metrics import STAGE_SECONDS, TOKEN_EXCHANGE_ERRORS, ToolMetricsMiddleware, cache_stats_callback, labelled_stats_callback, metrics
+from utilities.ociexecutor import OCIExecutor
+from utilities.pagination import compact, list_page
+from utilities.readiness import Readiness
+from utilities.responsecache import ResponseCache
+from utilities.singleflight import SingleFlight
+from utilities.ttlcache import TTLCache
+from utilities.upst import signer_claims
 
+load_dotenv()
+
+#Log records are queued and written by a background thread as JSON lines (LOG_FORMAT=text for plain text).
+#DEBUG/INFO messages are limited to LOG_RATE_LIMIT per second per message, 0 disables the limit.
+configure_logging(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    json_output=os.getenv("LOG_FORMAT", "json") == "json",
+    rate_limit=float(os.getenv("LOG_RATE_LIMIT", "10")),
+)
 logger = get_logger(__name__)
 
-# Store tokens on disk for persistence across restarts
-#token_storage = DiskCache(cache_dir="/Users/kgthakka/Downloads/agentdemo/sessionstore", ttl_hours=24)
-#token_storage = RedisTokenCache(redis_url="redis://{REDIS_SERVER}:6379") 
-#token_storage = InMemoryContextCache()
-_global_token_cache = {} #In memory cache for OCI session token signer
+#The OCI SDK imports every service client on first import; load it when first needed
+#(or during the startup warm-up) instead of at module load.
+oci = LazyModule("oci")
 
-load_dotenv()
 IAM_DOMAIN = os.getenv("IAM_DOMAIN")
 IAM_CLIENT_ID = os.getenv("IAM_CLIENT_ID")
 IAM_CLIENT_SECRET = os.getenv("IAM_CLIENT_SECRET")
@@ -30,44 +51,189 @@ IAM_GUID = os.getenv("IAM_GUID")
 IAM_TOKENEXCHANGE_CLIENT_ID = os.getenv("IAM_TOKENEXCHANGE_CLIENT_ID")
 IAM_TOKENEXCHANGE_CLIENT_SECRET = os.getenv("IAM_TOKENEXCHANGE_CLIENT_SECRET")
 
+#Point the server at other hosts, e.g. the local stand-in from benchmarks/fake_iam.py:
+#IAM_URL replaces https://{IAM_DOMAIN} for discovery and token exchange, OCI_SERVICE_ENDPOINT
+#replaces the regional endpoint of every OCI service client. OAUTH_REQUIRE_CONSENT=false skips the
+#proxy's consent page so scripted logins work; only use it for local testing.
+IAM_URL = (os.getenv("IAM_URL") or f"https://{IAM_DOMAIN}").rstrip("/")
+#Token exchange takes the domain GUID, or the full URL when IAM_URL is set
+TOKEN_EXCHANGE_DOMAIN = os.getenv("IAM_URL") or IAM_GUID
+OCI_SERVICE_ENDPOINT = os.getenv("OCI_SERVICE_ENDPOINT")
+OAUTH_REQUIRE_CONSENT = os.getenv("OAUTH_REQUIRE_CONSENT", "true").lower() != "false"
+
+#Disk and Redis stores hold upstream tokens and are encrypted with a key derived from STORAGE_ENCRYPTION_KEY,
+#falling back to the client secret. Keep it the same on every replica.
+STORAGE_ENCRYPTION_KEY = os.getenv("STORAGE_ENCRYPTION_KEY") or IAM_CLIENT_SECRET
+
+#Store OAuth client registrations and proxy state so they survive restarts and can be shared by replicas.
+#CLIENT_STORAGE is "memory", "disk" (CLIENT_STORAGE_DIR) or "redis" (REDIS_URL). Unset uses fastmcp's default store.
+client_storage = build_client_storage(
+    os.getenv("CLIENT_STORAGE"),
+    cache_dir=os.getenv("CLIENT_STORAGE_DIR", "./oauthstore"),
+    redis_url=os.getenv("REDIS_URL", "redis://localhost:6379"),
+    encryption_secret=STORAGE_ENCRYPTION_KEY,
+)
+
+#Bounded in memory cache for OCI session token signer, entries expire with the access token
+SIGNER_CACHE_MAX_SIZE = int(os.getenv("SIGNER_CACHE_MAX_SIZE", "1024"))
+_global_token_cache = TTLCache(max_size=SIGNER_CACHE_MAX_SIZE)
+
+#OCI clients are reused per (signer, region, client class) and dropped together with their signer
+CLIENT_POOL_MAX_SIZE = int(os.getenv("CLIENT_POOL_MAX_SIZE", "256"))
+_client_pool = OCIClientPool(max_size=CLIENT_POOL_MAX_SIZE, service_endpoint=OCI_SERVICE_ENDPOINT)
+_global_token_cache.add_evict_listener(lambda tokenID, signer: _client_pool.evict_signer(signer))
+
 auth = OCIProvider(
-    config_url= f"https://{IAM_DOMAIN}/.well-known/openid-configuration",
+    config_url=f"{IAM_URL}/.well-known/openid-configuration",
     client_id=IAM_CLIENT_ID,
     client_secret=IAM_CLIENT_SECRET,
     base_url="http://localhost:8000",
     required_scopes=["openid", "profile", "email"],
+    client_storage=client_storage,
+    require_authorization_consent=OAUTH_REQUIRE_CONSENT,
 )
 
-mcp = FastMCP("My MCP Server", auth=auth)
+#Warm-up run at startup; /ready reports 503 until the IAM domain signing keys and the OCI SDK are loaded
+_readiness = Readiness(retry_interval=float(os.getenv("READINESS_RETRY_SECONDS", "10")))
+_readiness.add_step("jwks", auth.warm_up)
+_readiness.add_step("oci_sdk", lambda: asyncio.to_thread(oci.load))
 
-def get_oci_signer(token: str, tokenID: str) -> TokenExchangeSigner:
-    """Create an OCI TokenExchangeSigner using the provided token."""
-    
-    #Check if the signer exists for the token ID in memory cache
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Run the warm-up in the background while the server starts accepting liveness checks."""
+    _readiness.start()
+    try:
+        yield
+    finally:
+        await _readiness.stop()
+        #Close the pooled IAM domain connections and stop the JWKS refresh
+        await auth.aclose()
+
+mcp = FastMCP("My MCP Server", auth=auth, lifespan=lifespan)
+#Correlate log records with the MCP request and the caller's token jti
+mcp.add_middleware(LogContextMiddleware())
+#Per-tool latency, status and in-flight count for /metrics
+mcp.add_middleware(ToolMetricsMiddleware())
+
+#Blocking OCI SDK service calls from async tools run in a bounded pool
+OCI_EXECUTOR_MAX_WORKERS = int(os.getenv("OCI_EXECUTOR_MAX_WORKERS", "16"))
+_oci_executor = OCIExecutor(
+    max_workers=OCI_EXECUTOR_MAX_WORKERS,
+    max_queue=int(os.getenv("OCI_EXECUTOR_MAX_QUEUE", "64")),
+    timeout=float(os.getenv("OCI_CALL_TIMEOUT", "30")),
+)
+
+#Token exchanges get their own small pool with a shorter timeout, so a slow IAM domain cannot take the
+#threads of OCI service calls, and tools that need no exchange (whoami, get_token, ...) never wait on it.
+TOKEN_EXCHANGE_MAX_WORKERS = int(os.getenv("TOKEN_EXCHANGE_MAX_WORKERS", "4"))
+_exchange_executor = OCIExecutor(
+    max_workers=TOKEN_EXCHANGE_MAX_WORKERS,
+    max_queue=int(os.getenv("TOKEN_EXCHANGE_MAX_QUEUE", "16")),
+    timeout=float(os.getenv("TOKEN_EXCHANGE_TIMEOUT", "10")),
+    name="oci-exchange",
+)
+
+#Admission control in front of both: the concurrency limit adapts to observed latency and a circuit breaker
+#fails fast while calls keep erroring. Shed calls return an MCP tool error instead of piling up.
+_exchange_admission = AdmissionController(
+    "IAM token exchange",
+    AdaptiveLimiter(
+        initial_limit=TOKEN_EXCHANGE_MAX_WORKERS,
+        max_limit=TOKEN_EXCHANGE_MAX_WORKERS,
+        target_latency=float(os.getenv("TOKEN_EXCHANGE_TARGET_LATENCY", "2")),
+    ),
+    CircuitBreaker(open_seconds=float(os.getenv("TOKEN_EXCHANGE_BREAKER_SECONDS", "30"))),
+)
+#OCI calls are admitted per region, so an outage in one region opens only that region's breaker.
+_oci_admission = AdmissionGroup(
+    lambda region: AdmissionController(
+        f"OCI API in {region}",
+        AdaptiveLimiter(
+            initial_limit=OCI_EXECUTOR_MAX_WORKERS,
+            max_limit=OCI_EXECUTOR_MAX_WORKERS,
+            target_latency=float(os.getenv("OCI_CALL_TARGET_LATENCY", "5")),
+        ),
+        CircuitBreaker(open_seconds=float(os.getenv("OCI_CALL_BREAKER_SECONDS", "30"))),
+    )
+)
+
+async def _call_oci(region: str, fn, *args, **kwargs):
+    """Run a blocking OCI SDK call in the executor under the admission control of its region."""
+    return await _oci_admission.call(region, _oci_executor.run, fn, *args, **kwargs)
+
+#Results of idempotent read tools, scoped to the caller's tenancy so they are never shared across tenants
+_response_cache = ResponseCache(max_size=int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "4096")))
+
+#Maximum number of regions queried at once by multi-region tools
+MULTI_REGION_CONCURRENCY = int(os.getenv("MULTI_REGION_CONCURRENCY", "8"))
+
+#Fields kept in the compact records returned by list tools
+REGION_FIELDS = ("key", "name")
+COMPARTMENT_FIELDS = ("id", "name", "description", "lifecycle_state", "time_created")
+BUCKET_FIELDS = ("name", "compartment_id", "time_created")
+
+#Concurrent cache misses for the same token ID share a single token exchange
+_signer_flight = SingleFlight()
+
+def _exchange_token(token: str, tokenID: str, expires_at: float | None) -> "oci.auth.signers.TokenExchangeSigner":
+    """Exchange the IAM domain token for OCI UPST and cache the signer object."""
+
+    #Another caller may have finished the exchange while we were waiting
     cached_signer = _global_token_cache.get(tokenID)
-    logger.debug(f"Global cached signer: {cached_signer}")
     if cached_signer:
-        logger.debug(f"Using globally cached signer for token ID: {tokenID}")
         return cached_signer
 
     #If the signer is not yet created for the token then create new OCI signer object
-    logger.debug(f"Creating new signer for token ID: {tokenID}")
-    signer = TokenExchangeSigner(
-        jwt_or_func=token,
-        oci_domain_id=IAM_GUID,
-        client_id=IAM_TOKENEXCHANGE_CLIENT_ID,
-        client_secret=IAM_TOKENEXCHANGE_CLIENT_SECRET
-    )
-    logger.debug(f"Signer {signer} created for token ID: {tokenID}")
-    
+    logger.debug("Creating new signer for token ID %s", tokenID)
+    with STAGE_SECONDS.time(stage="token_exchange"):
+        try:
+            #The domain is passed positionally: older SDKs name it oci_domain_id,
+            #newer ones oci_domain_url (which also accepts a full URL)
+            signer = oci.auth.signers.TokenExchangeSigner(
+                token,
+                TOKEN_EXCHANGE_DOMAIN,
+                client_id=IAM_TOKENEXCHANGE_CLIENT_ID,
+                client_secret=IAM_TOKENEXCHANGE_CLIENT_SECRET
+            )
+        except Exception as e:
+            TOKEN_EXCHANGE_ERRORS.inc(error=type(e).__name__)
+            raise
     #Cache the signer object in memory cache
-    _global_token_cache[tokenID] = signer
-    logger.debug(f"Signer cached for token ID: {tokenID}")
+    _global_token_cache.set(tokenID, signer, expires_at=expires_at)
+    logger.debug("Signer cached for token ID %s", tokenID)
 
     return signer
 
+async def get_oci_signer_async(token: str, tokenID: str, expires_at: float | None = None) -> "oci.auth.signers.TokenExchangeSigner":
+    """Return the OCI signer for a token, exchanging it on a cache miss.
+    The token exchange runs in the exchange executor under admission control so it does
+    not block the event loop, and concurrent callers for the same token share it."""
+
+    cached_signer = _global_token_cache.get(tokenID)
+    if cached_signer:
+        logger.debug("Using cached signer for token ID %s", tokenID)
+        return cached_signer
+
+    return await _signer_flight.do_async(
+        tokenID, _exchange_admission.call, _exchange_executor.run, _exchange_token, token, tokenID, expires_at
+    )
+
+@mcp.tool
+@_response_cache.cached(ttl=3600, scope="tenancy", stale_ttl=3600)
+async def list_regions(region: str, ctx: Context) -> dict:
+    """List all OCI regions available for the tenancy as {"items": [{"key", "name"}, ...], "count": int}"""
+    token = get_access_token()
+    signer = await get_oci_signer_async(token.token, token.claims.get("jti"), token.claims.get("exp"))
+    iam_client = _client_pool.get(oci.identity.IdentityClient, signer, region)
+
+    # List regions in the OCI executor so a slow region does not stall other clients
+    regions = (await _call_oci(region, iam_client.list_regions)).data
+    items = [compact(region, REGION_FIELDS) for region in regions]
+    return {"items": items, "count": len(items)}
+
 @mcp.tool
-def get_os_namespace(region: str, ctx: Context) -> str:
+@_response_cache.cached(ttl=86400, scope="tenancy", stale_ttl=3600)
+async def get_os_namespace(region: str, ctx: Context) -> str:
     """Get OCI Object Storage namespace for the tenancy"""
     
     """First create OCI Object storage client. 
@@ -77,14 +243,79 @@ def get_os_namespace(region: str, ctx: Context) -> str:
     token = get_access_token()
     tokenID = token.claims.get("jti")
     ac_token = token.token
-    signer = get_oci_signer(ac_token, tokenID)
-    object_storage_client = ociprovider.object_storage.ObjectStorageClient(config={'region': region}, signer=signer)
+    signer = await get_oci_signer_async(ac_token, tokenID, token.claims.get("exp"))
+    object_storage_client = _client_pool.get(oci.object_storage.ObjectStorageClient, signer, region)
 
-    # Get the namespace using Object Storage Client
-    namespace_response = object_storage_client.get_namespace()
+    # Get the namespace using Object Storage Client, off the event loop
+    namespace_response = await _call_oci(region, object_storage_client.get_namespace)
     namespace_name = namespace_response.data
     return namespace_name
 
+@mcp.tool
+async def get_os_namespace_multi_region(region: str, ctx: Context, regions: list[str] | None = None) -> dict:
+    """Get OCI Object Storage namespace in many regions with one call.
+    If regions is not given, all regions the tenancy subscribes to are queried.
+    Returns each region's result, {"ok": true, "result": namespace} or {"ok": false, "error": message}."""
+
+    """One signer is shared by all regions and the regions are queried concurrently,
+    so the call takes about as long as the slowest region.
+    """
+    token = get_access_token()
+    signer = await get_oci_signer_async(token.token, token.claims.get("jti"), token.claims.get("exp"))
+    if not regions:
+        #Look up the tenancy's subscribed regions, the tenancy OCID is in the UPST
+        iam_client = _client_pool.get(oci.identity.IdentityClient, signer, region)
+        subscriptions = await _call_oci(
+            region, iam_client.list_region_subscriptions, signer_claims(signer).get("tenant")
+        )
+        regions = [subscription.region_name for subscription in subscriptions.data]
+
+    async def get_namespace(region_name: str) -> str:
+        client = _client_pool.get(oci.object_storage.ObjectStorageClient, signer, region_name)
+        return (await _call_oci(region_name, client.get_namespace)).data
+
+    #Stream each region's result back as soon as it completes
+    async def report(region_name: str, outcome: dict, done: int, total: int):
+        await ctx.report_progress(done, total)
+        await ctx.info(f"{region_name}: {outcome.get('result') or outcome.get('error')}")
+
+    return await fan_out(regions, get_namespace, limit=MULTI_REGION_CONCURRENCY, on_result=report)
+
+@mcp.tool
+async def list_compartments(region: str, ctx: Context, compartment_id: str | None = None,
+                            cursor: str | None = None, limit: int = 100) -> dict:
+    """List compartments directly under compartment_id (defaults to the tenancy), at most limit (max 1000) per call.
+    Pass the returned next_cursor as cursor to get the next page; it is null after the last page."""
+    token = get_access_token()
+    signer = await get_oci_signer_async(token.token, token.claims.get("jti"), token.claims.get("exp"))
+    iam_client = _client_pool.get(oci.identity.IdentityClient, signer, region)
+    return await list_page(
+        functools.partial(_call_oci, region), iam_client.list_compartments,
+        compartment_id or signer_claims(signer).get("tenant"),
+        fields=COMPARTMENT_FIELDS, cursor=cursor, limit=limit, ctx=ctx,
+    )
+
+@mcp.tool
+async def list_buckets(region: str, ctx: Context, compartment_id: str | None = None,
+                       cursor: str | None = None, limit: int = 100) -> dict:
+    """List Object Storage buckets in compartment_id (defaults to the tenancy), at most limit (max 1000) per call.
+    Pass the returned next_cursor as cursor to get the next page; it is null after the last page."""
+    token = get_access_token()
+    signer = await get_oci_signer_async(token.token, token.claims.get("jti"), token.claims.get("exp"))
+    object_storage_client = _client_pool.get(oci.object_storage.ObjectStorageClient, signer, region)
+    namespace_name = (await _call_oci(region, object_storage_client.get_namespace)).data
+    return await list_page(
+        functools.partial(_call_oci, region), object_storage_client.list_buckets, namespace_name,
+        compartment_id or signer_claims(signer).get("tenant"),
+        fields=BUCKET_FIELDS, cursor=cursor, limit=limit, ctx=ctx,
+    )
+
+@mcp.tool
+async def clear_cached_responses(tool: str | None = None) -> int:
+    """Drop the caller's cached results of read tools such as get_os_namespace, so the next call goes to OCI.
+    Pass tool to clear only that tool's results. Returns the number of cached results removed."""
+    return _response_cache.invalidate_caller(tool)
+
 @mcp.tool
 def whoami(ctx: Context) -> str:
     """The whoami function is to test MCP server without requiring token exchange.
@@ -112,11 +343,50 @@ async def get_access_token_claims() -> dict:
         "jti": token.claims.get("jti")
     }
 
-if __name__ == "__main__":
-    mcp.run(transport="http", port=8000)
-    
+#Expose hit/miss/eviction counters of the in-process caches and pools on /metrics
+metrics.callback(
+    "mcp_cache_stats",
+    "Counters and sizes reported by the caches, pools, executors and admission controllers",
+    cache_stats_callback({
+        "signer": _global_token_cache,
+        "client_pool": _client_pool,
+        "response": _response_cache,
+        "signer_flight": _signer_flight,
+        "oci_executor": _oci_executor,
+        "exchange_executor": _exchange_executor,
+        "oci_admission": _oci_admission,
+        "exchange_admission": _exchange_admission,
+    }),
+)
+
+#Verified-token cache counters and hit rate, and request counts and latency per IAM domain endpoint
+metrics.callback(
+    "mcp_auth_stats",
+    "Verified access token cache counters and hit rate of OCIProvider",
+    labelled_stats_callback(auth.token_cache_stats, "field"),
+)
+metrics.callback(
+    "mcp_upstream_stats",
+    "Requests, errors and average/max seconds per IAM domain endpoint",
+    labelled_stats_callback(auth.upstream_stats, "endpoint", "field"),
+)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request) -> PlainTextResponse:
-    """This custom route can be used to run health check against MCP server.
-    If you deploy load balancer, it can use /health URL to run the health check."""
-    return PlainTextResponse("OK")
\ No newline at end of file
+    """This custom route can be used to run liveness check against MCP server."""
+    return PlainTextResponse("OK")
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def readiness_check(request: Request) -> JSONResponse:
+    """This custom route can be used by a load balancer as readiness check.
+    It returns 503 until the startup warm-up has finished."""
+    ready, steps = _readiness.check()
+    return JSONResponse({"ready": ready, "steps": steps}, status_code=200 if ready else 503)
+
+if __name__ == "__main__":
+    mcp.run(transport="http", port=8000)
\ No newline at end of file
@@ -1,18 +1,51 @@
+import asyncio
+import functools
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-import oci
-
 from fastmcp import Context, FastMCP
 from fastmcp.server.auth.oidc_proxy import OIDCProxy
+from fastmcp.server.auth.providers.jwt import JWTVerifier
 from fastmcp.server.dependencies import get_access_token
-from oci.auth.signers import TokenExchangeSigner
+from fastmcp.utilities.logging import get_logger
 
-from starlette.responses import PlainTextResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.requests import Request
 
+from utilities.admission import AdaptiveLimiter, AdmissionController, AdmissionGroup, CircuitBreaker
+from utilities.clientpool import OCIClientPool
+from utilities.encryption import storage_fernet
+from utilities.fanout import fan_out
+from utilities.keyvalue import build_client_storage
+from utilities.lazyimport import LazyModule
+from utilities.logpipeline import LogContextMiddleware, configure_logging
+from utilities.metrics import STAGE_SECONDS, TOKEN_EXCHANGE_ERRORS, ToolMetricsMiddleware, cache_stats_callback, metrics
+from utilities.ociexecutor import OCIExecutor
+from utilities.pagination import compact, list_page
+from utilities.readiness import Readiness, prefetch_jwks
+from utilities.responsecache import ResponseCache
+from utilities.singleflight import SingleFlight
+from utilities.tieredcache import DiskSignerStore, TieredSignerCache
+from utilities.tokenrefresher import TokenRefresher
+from utilities.ttlcache import TTLCache
+from utilities.upst import signer_claims, signer_expiry
+
+# The OCI SDK imports every service client on first import; load it when first needed
+# (or during the startup warm-up) instead of at module load.
+oci = LazyModule("oci")
+
 # Load Environment variables from .env file
 load_dotenv()
+
+# Log records are queued and written by a background thread as JSON lines (LOG_FORMAT=text for plain text).
+# DEBUG/INFO messages are limited to LOG_RATE_LIMIT per second per message, 0 disables the limit.
+configure_logging(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    json_output=os.getenv("LOG_FORMAT", "json") == "json",
+    rate_limit=float(os.getenv("LOG_RATE_LIMIT", "10")),
+)
+logger = get_logger(__name__)
 # Create .env file with IDCS_DOMAIN, IDCS_CLIENT_ID, IDCS_CLIENT_SECRET variables.
 # IDCS_CLIENT_ID and IDCS_CLIENT_SECRET are from the IAM Domain OAuth2 client credentials.
 # IDCS_DOMAIN is the domain name of the created IAM Domain.
@@ -20,36 +53,277 @@ IDCS_DOMAIN = os.getenv("IDCS_DOMAIN")
 IDCS_CLIENT_ID = os.getenv("IDCS_CLIENT_ID")
 IDCS_CLIENT_SECRET = os.getenv("IDCS_CLIENT_SECRET")
 
-# Simple in-memory global cache for signers
-# In production, consider using a more robust caching mechanism
-_global_token_cache = {}
+# Point the server at other hosts, e.g. the local stand-in from benchmarks/fake_iam.py:
+# IDCS_URL replaces https://{IDCS_DOMAIN} for discovery and token exchange, OCI_SERVICE_ENDPOINT
+# replaces the regional endpoint of every OCI service client. OAUTH_REQUIRE_CONSENT=false skips the
+# proxy's consent page so scripted logins work; only use it for local testing.
+IDCS_URL = (os.getenv("IDCS_URL") or f"https://{IDCS_DOMAIN}").rstrip("/")
+# Token exchange takes the domain ID, or the full URL when IDCS_URL is set
+TOKEN_EXCHANGE_DOMAIN = os.getenv("IDCS_URL") or (IDCS_DOMAIN or "").split(".")[0]
+OCI_SERVICE_ENDPOINT = os.getenv("OCI_SERVICE_ENDPOINT")
+OAUTH_REQUIRE_CONSENT = os.getenv("OAUTH_REQUIRE_CONSENT", "true").lower() != "false"
+
+# WORKERS > 1 serves from that many processes sharing one listening socket (uvicorn workers).
+# An authorization flow may then start on one worker and finish on another, so OAuth proxy state and
+# exchanged signers must live in a store every worker can reach: CLIENT_STORAGE and SIGNER_L2 default
+# to "disk" and "memory" is rejected. Set JWT_SIGNING_KEY so every worker signs and verifies the
+# proxy's tokens with the same key.
+WORKERS = int(os.getenv("WORKERS", "1"))
+JWT_SIGNING_KEY = os.getenv("JWT_SIGNING_KEY")
+CLIENT_STORAGE = os.getenv("CLIENT_STORAGE") or ("disk" if WORKERS > 1 else None)
+if WORKERS > 1 and CLIENT_STORAGE == "memory":
+    raise ValueError("CLIENT_STORAGE=memory cannot be shared by multiple workers, use disk or redis")
+
+# Disk and Redis stores hold upstream tokens and UPSTs with their private keys, so CLIENT_STORAGE and
+# SIGNER_L2 values are encrypted with a key derived from STORAGE_ENCRYPTION_KEY,
+# falling back to JWT_SIGNING_KEY, then the client secret. Keep it the same on every worker and replica.
+STORAGE_ENCRYPTION_KEY = os.getenv("STORAGE_ENCRYPTION_KEY") or JWT_SIGNING_KEY or IDCS_CLIENT_SECRET
+
+# Store OAuth client registrations and proxy state so they survive restarts and can be shared by replicas.
+# CLIENT_STORAGE is "memory", "disk" (CLIENT_STORAGE_DIR) or "redis" (REDIS_URL). Unset uses fastmcp's default store.
+client_storage = build_client_storage(
+    CLIENT_STORAGE,
+    cache_dir=os.getenv("CLIENT_STORAGE_DIR", "./oauthstore"),
+    redis_url=os.getenv("REDIS_URL", "redis://localhost:6379"),
+    encryption_secret=STORAGE_ENCRYPTION_KEY,
+)
+
+# Bounded in-memory cache for signers keyed by access token jti.
+# Entries expire with the access token and the least recently used signer is evicted when full.
+SIGNER_CACHE_MAX_SIZE = int(os.getenv("SIGNER_CACHE_MAX_SIZE", "1024"))
+_global_token_cache = TTLCache(max_size=SIGNER_CACHE_MAX_SIZE)
+
+# OCI clients are reused per (signer, region, client class) to keep HTTP connections alive.
+# Clients are dropped together with their signer.
+CLIENT_POOL_MAX_SIZE = int(os.getenv("CLIENT_POOL_MAX_SIZE", "256"))
+_client_pool = OCIClientPool(max_size=CLIENT_POOL_MAX_SIZE, service_endpoint=OCI_SERVICE_ENDPOINT)
+_global_token_cache.add_evict_listener(lambda tokenID, signer: _client_pool.evict_signer(signer))
+
+# Optional shared L2 for signers so replicas behind a load balancer reuse exchanged tokens.
+# SIGNER_L2 is "redis" (REDIS_URL, also used for cross-replica invalidation) or "disk" (SIGNER_DISK_DIR).
+SIGNER_L2 = os.getenv("SIGNER_L2") or ("disk" if WORKERS > 1 else "")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+SIGNER_DISK_DIR = os.getenv("SIGNER_DISK_DIR", "./sessionstore")
+
+def _build_signer_cache() -> TieredSignerCache:
+    """Put the in-process signer cache in front of the configured L2 store."""
+    if SIGNER_L2 == "redis":
+        from utilities.rediscache import AsyncRedisTokenCache
+        l2 = AsyncRedisTokenCache(redis_url=REDIS_URL, fernet=storage_fernet(STORAGE_ENCRYPTION_KEY))
+        return TieredSignerCache(_global_token_cache, l2, redis_client=l2.redis_client)
+    if SIGNER_L2 == "disk":
+        from utilities.diskcache import DiskCache
+        store = DiskSignerStore(DiskCache(cache_dir=SIGNER_DISK_DIR), fernet=storage_fernet(STORAGE_ENCRYPTION_KEY))
+        return TieredSignerCache(_global_token_cache, store)
+    return TieredSignerCache(_global_token_cache)
+
+_signer_cache = _build_signer_cache()
+
+# Blocking OCI SDK service calls from async tools run in a bounded pool
+OCI_EXECUTOR_MAX_WORKERS = int(os.getenv("OCI_EXECUTOR_MAX_WORKERS", "16"))
+_oci_executor = OCIExecutor(
+    max_workers=OCI_EXECUTOR_MAX_WORKERS,
+    max_queue=int(os.getenv("OCI_EXECUTOR_MAX_QUEUE", "64")),
+    timeout=float(os.getenv("OCI_CALL_TIMEOUT", "30")),
+)
+
+# Token exchanges get their own small pool with a shorter timeout, so a slow IAM domain cannot take the
+# threads of OCI service calls, and tools that need no exchange (whoami, get_token, ...) never wait on it.
+TOKEN_EXCHANGE_MAX_WORKERS = int(os.getenv("TOKEN_EXCHANGE_MAX_WORKERS", "4"))
+_exchange_executor = OCIExecutor(
+    max_workers=TOKEN_EXCHANGE_MAX_WORKERS,
+    max_queue=int(os.getenv("TOKEN_EXCHANGE_MAX_QUEUE", "16")),
+    timeout=float(os.getenv("TOKEN_EXCHANGE_TIMEOUT", "10")),
+    name="oci-exchange",
+)
+
+# Admission control in front of both: the concurrency limit adapts to observed latency and a circuit breaker
+# fails fast while calls keep erroring. Shed calls return an MCP tool error instead of piling up.
+_exchange_admission = AdmissionController(
+    "IAM token exchange",
+    AdaptiveLimiter(
+        initial_limit=TOKEN_EXCHANGE_MAX_WORKERS,
+        max_limit=TOKEN_EXCHANGE_MAX_WORKERS,
+        target_latency=float(os.getenv("TOKEN_EXCHANGE_TARGET_LATENCY", "2")),
+    ),
+    CircuitBreaker(open_seconds=float(os.getenv("TOKEN_EXCHANGE_BREAKER_SECONDS", "30"))),
+)
+# OCI calls are admitted per region, so an outage in one region opens only that region's breaker.
+_oci_admission = AdmissionGroup(
+    lambda region: AdmissionController(
+        f"OCI API in {region}",
+        AdaptiveLimiter(
+            initial_limit=OCI_EXECUTOR_MAX_WORKERS,
+            max_limit=OCI_EXECUTOR_MAX_WORKERS,
+            target_latency=float(os.getenv("OCI_CALL_TARGET_LATENCY", "5")),
+        ),
+        CircuitBreaker(open_seconds=float(os.getenv("OCI_CALL_BREAKER_SECONDS", "30"))),
+    )
+)
+
+async def _call_oci(region: str, fn, *args, **kwargs):
+    """Run a blocking OCI SDK call in the executor under the admission control of its region."""
+    return await _oci_admission.call(region, _oci_executor.run, fn, *args, **kwargs)
+
+# Results of idempotent read tools, scoped to the caller's tenancy so they are never shared across tenants
+_response_cache = ResponseCache(max_size=int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "4096")))
+
+# Maximum number of regions queried at once by multi-region tools
+MULTI_REGION_CONCURRENCY = int(os.getenv("MULTI_REGION_CONCURRENCY", "8"))
+
+# Fields kept in the compact records returned by list tools
+REGION_FIELDS = ("key", "name")
+COMPARTMENT_FIELDS = ("id", "name", "description", "lifecycle_state", "time_created")
+BUCKET_FIELDS = ("name", "compartment_id", "time_created")
+
+# Concurrent cache misses for the same token ID share a single token exchange
+_signer_flight = SingleFlight()
+
+def _create_signer(token: str) -> "oci.auth.signers.TokenExchangeSigner":
+    """Exchange the IAM domain token for an OCI UPST."""
+    with STAGE_SECONDS.time(stage="token_exchange"):
+        try:
+            # The domain is passed positionally: older SDKs name it oci_domain_id,
+            # newer ones oci_domain_url (which also accepts a full URL)
+            return oci.auth.signers.TokenExchangeSigner(
+                token,
+                TOKEN_EXCHANGE_DOMAIN,
+                client_id=IDCS_CLIENT_ID,
+                client_secret=IDCS_CLIENT_SECRET,
+            )
+        except Exception as e:
+            TOKEN_EXCHANGE_ERRORS.inc(error=type(e).__name__)
+            raise
+
+def _exchange_token(token: str, tokenID: str, expires_at: float | None) -> "oci.auth.signers.TokenExchangeSigner":
+    """Exchange the IAM domain token for an OCI UPST and cache the resulting signer."""
+    cached_signer = _global_token_cache.get(tokenID)
+    if cached_signer:
+        return cached_signer
+    logger.debug("Creating new signer for token ID %s", tokenID)
+    signer = _create_signer(token)
+    _global_token_cache.set(tokenID, signer, expires_at=expires_at)
+    logger.debug("Signer cached for token ID %s", tokenID)
+    return signer
+
+def _refresh_in_place(signer) -> "oci.auth.signers.TokenExchangeSigner":
+    """Exchange the token again inside an existing TokenExchangeSigner (new session key and UPST)."""
+    with STAGE_SECONDS.time(stage="token_exchange"):
+        try:
+            signer.refresh_security_token()
+        except Exception as e:
+            TOKEN_EXCHANGE_ERRORS.inc(error=type(e).__name__)
+            raise
+    return signer
+
+async def _refresh_signer(token: str, tokenID: str, expires_at: float | None) -> "oci.auth.signers.TokenExchangeSigner":
+    """Re-exchange a token ahead of UPST expiry and write the new UPST through to both tiers.
+    The cached TokenExchangeSigner is refreshed in place, so the OCI clients pooled for it stay
+    open; a signer loaded from L2 cannot refresh itself and is replaced."""
+    signer = _global_token_cache.get(tokenID)
+    if hasattr(signer, "refresh_security_token"):
+        signer = await _exchange_admission.call(_exchange_executor.run, _refresh_in_place, signer)
+    else:
+        signer = await _exchange_admission.call(_exchange_executor.run, _create_signer, token)
+    await _signer_cache.set(tokenID, signer, expires_at=expires_at)
+    return signer
+
+# Signers of active sessions are re-exchanged in the background before their UPST expires,
+# so tool calls rarely pay for the IAM round trip.
+_token_refresher = TokenRefresher(
+    _refresh_signer,
+    signer_expiry,
+    lead_time=float(os.getenv("TOKEN_REFRESH_LEAD_SECONDS", "300")),
+    interval=float(os.getenv("TOKEN_REFRESH_INTERVAL_SECONDS", "30")),
+    max_concurrency=int(os.getenv("TOKEN_REFRESH_MAX_CONCURRENCY", "4")),
+    jitter=float(os.getenv("TOKEN_REFRESH_JITTER_SECONDS", "30")),
+)
+# Stop refreshing sessions whose signer left L1 (LRU eviction, expiry, invalidation).
+# A refresh replacing a signer loaded from L2 leaves the key in the cache and keeps it tracked.
+def _forget_evicted_signer(tokenID: str, signer):
+    if tokenID not in _global_token_cache:
+        _token_refresher.forget(tokenID)
+
+_global_token_cache.add_evict_listener(_forget_evicted_signer)
+
+async def _load_or_exchange_signer(token: str, tokenID: str, expires_at: float | None) -> "oci.auth.signers.TokenExchangeSigner":
+    """Load the signer from the shared L2, or exchange the token and write it through to both tiers."""
+    signer = await _signer_cache.get_l2(tokenID)
+    if signer is None:
+        signer = await _exchange_admission.call(_exchange_executor.run, _exchange_token, token, tokenID, expires_at)
+        await _signer_cache.set(tokenID, signer, expires_at=expires_at)
+    _token_refresher.track(tokenID, token, expires_at, signer)
+    return signer
 
-# Get an instance of OCI Token Exchange Signer
-def get_oci_signer() -> TokenExchangeSigner:
-    """Create an OCI TokenExchangeSigner using the provided token."""
+async def get_oci_signer_async() -> "oci.auth.signers.TokenExchangeSigner":
+    """Return the OCI signer for the caller's access token. Checks the in-process cache, then
+    the shared L2. The token exchange runs off the event loop under admission control and
+    concurrent tool calls for the same token await a single exchange."""
     
     mcp_token = get_access_token()
     tokenID = mcp_token.claims.get("jti")
-    token = mcp_token.token 
     
     cached_signer = _global_token_cache.get(tokenID)
-    print(f"Global cached signer: {cached_signer}")
     if cached_signer:
-        print(f"Using globally cached signer for token ID: {tokenID}")
+        _token_refresher.touch(tokenID)
         return cached_signer
-    print(f"Creating new signer for token ID: {tokenID}")
-    signer = TokenExchangeSigner(
-        jwt_or_func=token,
-        oci_domain_id=IDCS_DOMAIN.split(".")[0],
-        client_id=IDCS_CLIENT_ID,
-        client_secret=IDCS_CLIENT_SECRET,
+    return await _signer_flight.do_async(
+        tokenID, _load_or_exchange_signer, mcp_token.token, tokenID, mcp_token.claims.get("exp")
     )
-    _global_token_cache[tokenID] = signer
-    print(f"Signer cached globally for token ID: {tokenID}")
-    return signer
 
-auth = OIDCProxy(
-    config_url=f"https://{IDCS_DOMAIN}/.well-known/openid-configuration",
+async def invalidate_oci_signer(tokenID: str):
+    """Drop the signer for a token on every replica. Called when a client revokes its access token."""
+    _token_refresher.forget(tokenID)
+    await _signer_cache.invalidate(tokenID)
+
+# Warm-up run at startup; /ready reports 503 until the signing keys and persisted signers are loaded,
+# so a new replica only gets traffic once tool calls take the warm path.
+_readiness = Readiness(retry_interval=float(os.getenv("READINESS_RETRY_SECONDS", "10")))
+_readiness.add_step("jwks", lambda: prefetch_jwks(getattr(auth, "_token_validator", None)))
+_readiness.add_step("signer_l2", _signer_cache.warm_up)
+_readiness.add_step("oci_sdk", lambda: asyncio.to_thread(oci.load))
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Start and stop background work tied to the server lifecycle."""
+    await _signer_cache.start()
+    await _token_refresher.start()
+    _readiness.start()
+    try:
+        yield
+    finally:
+        await _readiness.stop()
+        await _token_refresher.stop()
+        await _signer_cache.stop()
+
+class _TimedJWTVerifier(JWTVerifier):
+    """JWTVerifier that records upstream access token verification as the jwt_validation stage."""
+
+    async def load_access_token(self, token: str):
+        with STAGE_SECONDS.time(stage="jwt_validation"):
+            return await super().load_access_token(token)
+
+class _ServerOIDCProxy(OIDCProxy):
+    """OIDCProxy that times token verification and drops a revoked access token's signer on every replica."""
+
+    def get_token_verifier(self, *, algorithm=None, audience=None, required_scopes=None, timeout_seconds=None):
+        return _TimedJWTVerifier(
+            jwks_uri=str(self.oidc_config.jwks_uri),
+            issuer=str(self.oidc_config.issuer),
+            algorithm=algorithm,
+            audience=audience,
+            required_scopes=required_scopes,
+        )
+
+    async def revoke_token(self, token):
+        await super().revoke_token(token)
+        # Refresh tokens carry no jti of an access token, their signers expire with the access token
+        tokenID = (getattr(token, "claims", None) or {}).get("jti")
+        if tokenID:
+            await invalidate_oci_signer(tokenID)
+
+auth = _ServerOIDCProxy(
+    config_url=f"{IDCS_URL}/.well-known/openid-configuration",
     client_id=IDCS_CLIENT_ID,
     client_secret=IDCS_CLIENT_SECRET,
     # FastMCP endpoint
@@ -57,29 +331,38 @@ auth = OIDCProxy(
     # audience=IDCS_CLIENT_ID,
     required_scopes=["openid", "profile", "email"],
     # redirect_path="/custom/callback",
+    client_storage=client_storage,
+    jwt_signing_key=JWT_SIGNING_KEY,
+    require_authorization_consent=OAUTH_REQUIRE_CONSENT,
 )
 
-mcp = FastMCP(name="My Server", auth=auth)
+mcp = FastMCP(name="My Server", auth=auth, lifespan=lifespan)
+# Correlate log records with the MCP request and the caller's token jti
+mcp.add_middleware(LogContextMiddleware())
+# Per-tool latency, status and in-flight count for /metrics
+mcp.add_middleware(ToolMetricsMiddleware())
 
 @mcp.tool
-async def list_regions(region: str, ctx: Context) -> str:
+@_response_cache.cached(ttl=3600, scope="tenancy", stale_ttl=3600)
+async def list_regions(region: str, ctx: Context) -> dict:
     """List all OCI regions available for the tenancy
     Input: region (str)
-    Output: regions (str)
+    Output: {"items": [{"key", "name"}, ...], "count": int}
     """
     
     """Create OCI Object storage client using token exchange signer. 
     We will exchange IAM domain JWT token for OCI UPST token and use the UPST token to create signer object.
     """
-    signer = get_oci_signer()
-    iam_client = oci.identity.IdentityClient(config={'region': region}, signer=signer)
+    signer = await get_oci_signer_async()
+    iam_client = _client_pool.get(oci.identity.IdentityClient, signer, region)
 
     # Get the regions from the identity client
-    regions = iam_client.list_regions().data
-    print(f"Regions are {regions}")
-    return regions.__str__()
+    regions = (await _call_oci(region, iam_client.list_regions)).data
+    items = [compact(region, REGION_FIELDS) for region in regions]
+    return {"items": items, "count": len(items)}
 
 @mcp.tool
+@_response_cache.cached(ttl=86400, scope="tenancy", stale_ttl=3600)
 async def get_os_namespace(region: str, ctx: Context) -> str:
     """Get OCI Object Storage namespace for the tenancy
     Input: region (str)
@@ -90,14 +373,87 @@ async def get_os_namespace(region: str, ctx: Context) -> str:
     We will exchange IAM domain JWT token for OCI UPST token and use the UPST token to create signer object.
     """
     
-    signer = get_oci_signer()
-    object_storage_client = oci.object_storage.ObjectStorageClient(config={'region': region}, signer=signer)
+    signer = await get_oci_signer_async()
+    object_storage_client = _client_pool.get(oci.object_storage.ObjectStorageClient, signer, region)
 
     # Get the namespace
-    namespace_response = object_storage_client.get_namespace()
+    namespace_response = await _call_oci(region, object_storage_client.get_namespace)
     namespace_name = namespace_response.data
     return namespace_name
 
+@mcp.tool
+async def get_os_namespace_multi_region(region: str, ctx: Context, regions: list[str] | None = None) -> dict:
+    """Get OCI Object Storage namespace in many regions with one call
+    Input: region (str) used to look up subscribed regions, regions (list[str], optional, defaults to all subscribed regions)
+    Output: per-region result, {"ok": true, "result": namespace} or {"ok": false, "error": message}
+    """
+    
+    """One signer is shared by all regions and the regions are queried concurrently,
+    so the call takes about as long as the slowest region. Each region's result is
+    reported through the context as soon as it completes.
+    """
+    signer = await get_oci_signer_async()
+    if not regions:
+        iam_client = _client_pool.get(oci.identity.IdentityClient, signer, region)
+        subscriptions = await _call_oci(
+            region, iam_client.list_region_subscriptions, signer_claims(signer).get("tenant")
+        )
+        regions = [subscription.region_name for subscription in subscriptions.data]
+
+    async def get_namespace(region_name: str) -> str:
+        client = _client_pool.get(oci.object_storage.ObjectStorageClient, signer, region_name)
+        return (await _call_oci(region_name, client.get_namespace)).data
+
+    async def report(region_name: str, outcome: dict, done: int, total: int):
+        await ctx.report_progress(done, total)
+        await ctx.info(f"{region_name}: {outcome.get('result') or outcome.get('error')}")
+
+    return await fan_out(regions, get_namespace, limit=MULTI_REGION_CONCURRENCY, on_result=report)
+
+@mcp.tool
+async def list_compartments(region: str, ctx: Context, compartment_id: str | None = None,
+                            cursor: str | None = None, limit: int = 100) -> dict:
+    """List compartments directly under a compartment, one page at a time
+    Input: region (str), compartment_id (str, optional, defaults to the tenancy),
+           cursor (str, optional, next_cursor of the previous call), limit (int, max 1000)
+    Output: {"items": [{"id", "name", "description", "lifecycle_state", "time_created"}, ...],
+             "count": int, "next_cursor": str or null when there are no more results}
+    """
+    signer = await get_oci_signer_async()
+    iam_client = _client_pool.get(oci.identity.IdentityClient, signer, region)
+    return await list_page(
+        functools.partial(_call_oci, region), iam_client.list_compartments,
+        compartment_id or signer_claims(signer).get("tenant"),
+        fields=COMPARTMENT_FIELDS, cursor=cursor, limit=limit, ctx=ctx,
+    )
+
+@mcp.tool
+async def list_buckets(region: str, ctx: Context, compartment_id: str | None = None,
+                       cursor: str | None = None, limit: int = 100) -> dict:
+    """List Object Storage buckets in a compartment, one page at a time
+    Input: region (str), compartment_id (str, optional, defaults to the tenancy),
+           cursor (str, optional, next_cursor of the previous call), limit (int, max 1000)
+    Output: {"items": [{"name", "compartment_id", "time_created"}, ...],
+             "count": int, "next_cursor": str or null when there are no more results}
+    """
+    signer = await get_oci_signer_async()
+    object_storage_client = _client_pool.get(oci.object_storage.ObjectStorageClient, signer, region)
+    namespace_name = (await _call_oci(region, object_storage_client.get_namespace)).data
+    return await list_page(
+        functools.partial(_call_oci, region), object_storage_client.list_buckets, namespace_name,
+        compartment_id or signer_claims(signer).get("tenant"),
+        fields=BUCKET_FIELDS, cursor=cursor, limit=limit, ctx=ctx,
+    )
+
+@mcp.tool
+async def clear_cached_responses(tool: str | None = None) -> int:
+    """Drop the caller's cached results of read tools such as get_os_namespace, so the next call goes to OCI.
+    Input: tool (str, optional) to clear only one tool's results
+    Output: number of cached results removed (int)
+    """
+    
+    return _response_cache.invalidate_caller(tool)
+
 @mcp.tool
 def whoami(ctx: Context) -> str:
     """The whoami tool is to test MCP server without requiring token exchange.
@@ -128,9 +484,46 @@ async def get_access_token_claims() -> dict:
         "jti": token.claims.get("jti")
     }
 
-if __name__ == "__main__":
-    mcp.run(transport="http", port=8000)
+# Expose hit/miss/eviction counters of the in-process caches and pools on /metrics
+metrics.callback(
+    "mcp_cache_stats",
+    "Counters and sizes reported by the caches, pools, executors and admission controllers",
+    cache_stats_callback({
+        "signer": _signer_cache,
+        "client_pool": _client_pool,
+        "response": _response_cache,
+        "signer_flight": _signer_flight,
+        "oci_executor": _oci_executor,
+        "exchange_executor": _exchange_executor,
+        "oci_admission": _oci_admission,
+        "exchange_admission": _exchange_admission,
+    }),
+)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request) -> PlainTextResponse:
+    """Liveness: the process is up and serving requests."""
     return PlainTextResponse("OK")
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def readiness_check(request: Request) -> JSONResponse:
+    """Readiness: 200 once the startup warm-up has finished, 503 with the pending steps before that."""
+    ready, steps = _readiness.check()
+    return JSONResponse({"ready": ready, "steps": steps}, status_code=200 if ready else 503)
+
+def create_app():
+    """ASGI app factory for running under uvicorn, e.g. uvicorn server:create_app --factory --workers 4"""
+    return mcp.http_app()
+
+if __name__ == "__main__":
+    if WORKERS > 1:
+        import uvicorn
+        # Each worker imports this module and builds its own app; shared state lives in CLIENT_STORAGE/SIGNER_L2
+        uvicorn.run("server:create_app", factory=True, host="127.0.0.1", port=8000, workers=WORKERS)
+    else:
+        mcp.run(transport="http", port=8000)
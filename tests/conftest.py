@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The utilities are imported the way the servers import them, from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from fastmcp.exceptions import ToolError  # noqa: E402
+
+from utilities.admission import (  # noqa: E402
+    AdmissionController,
+    AdmissionGroup,
+    CircuitBreaker,
+    CircuitOpen,
+    server_side_failure,
+)
+
+
+def _group(max_keys=64):
+    return AdmissionGroup(
+        lambda region: AdmissionController(region, breaker=CircuitBreaker(min_calls=2, open_seconds=60)),
+        max_keys=max_keys,
+    )
+
+
+async def _fail():
+    raise RuntimeError("region down")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_opens_only_for_the_failing_region():
+    async def main():
+        group = _group()
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await group.call("us-ashburn-1", _fail)
+        with pytest.raises(CircuitOpen):
+            await group.call("us-ashburn-1", _ok)
+        return await group.call("eu-frankfurt-1", _ok), group.stats()
+
+    result, stats = asyncio.run(main())
+    assert result == "ok"
+    assert stats["us-ashburn-1"]["open"] == 1
+    assert stats["eu-frankfurt-1"]["open"] == 0
+
+
+def test_least_recently_used_region_is_dropped():
+    group = _group(max_keys=2)
+    first = group.get("a")
+    group.get("b")
+    assert group.get("a") is first
+    group.get("c")
+    assert set(group.stats()) == {"a", "c"}
+
+
+def _http_error(status: int):
+    from oci._vendor.requests import HTTPError, Response
+
+    response = Response()
+    response.status_code = status
+    return HTTPError(f"{status} error", response=response)
+
+
+def _service_error(status: int):
+    from oci.exceptions import ServiceError
+
+    return ServiceError(status, "Error", {}, "message")
+
+
+def test_token_exchange_client_errors_are_not_failures():
+    pytest.importorskip("oci")
+    assert server_side_failure(_http_error(400)) is False
+    assert server_side_failure(_http_error(401)) is False
+    assert server_side_failure(_http_error(429)) is True
+    assert server_side_failure(_http_error(503)) is True
+
+
+def test_oci_service_client_errors_are_not_failures():
+    pytest.importorskip("oci")
+    assert server_side_failure(_service_error(404)) is False
+    assert server_side_failure(_service_error(429)) is True
+    assert server_side_failure(_service_error(500)) is True
+
+
+def test_httpx_errors_tool_errors_and_other_exceptions():
+    import httpx
+
+    request = httpx.Request("POST", "https://iam.test/oauth2/v1/token")
+    rejected = httpx.HTTPStatusError("401", request=request, response=httpx.Response(401, request=request))
+    assert server_side_failure(rejected) is False
+    assert server_side_failure(httpx.ConnectError("refused", request=request)) is True
+    assert server_side_failure(ToolError("bad input")) is False
+    assert server_side_failure(RuntimeError("boom")) is True
+
+
+def test_rejected_user_tokens_do_not_open_the_breaker():
+    pytest.importorskip("oci")
+
+    async def rejected():
+        raise _http_error(401)
+
+    async def main():
+        controller = AdmissionController("IAM token exchange", breaker=CircuitBreaker(min_calls=2))
+        for _ in range(5):
+            with pytest.raises(Exception):
+                await controller.call(rejected)
+        return controller.stats()
+
+    assert asyncio.run(main())["open"] == 0
@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from utilities.diskcache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DiskCache(cache_dir=str(tmp_path), sweep_interval=0)
+    yield cache
+    cache.close()
+
+
+def test_set_get_delete(cache):
+    cache.set("a", {"token": "x"})
+    assert cache.get("a") == {"token": "x"}
+    value, expires_at = cache.get_entry("a")
+    assert value == {"token": "x"}
+    assert expires_at > time.time()
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+    assert cache.get("a") is None
+
+
+def test_expired_entries_are_hidden_and_swept(cache):
+    cache.set("old", 1, ttl=-1)
+    cache.set("new", 2, ttl=60)
+    assert cache.get("old") is None
+    assert [key for key, _, _ in cache.items()] == ["new"]
+    assert cache.sweep() == 1
+
+
+def test_entries_survive_reopening(tmp_path):
+    first = DiskCache(cache_dir=str(tmp_path), sweep_interval=0)
+    first.set("a", [1, 2, 3])
+    first.close()
+    second = DiskCache(cache_dir=str(tmp_path), sweep_interval=0)
+    try:
+        assert second.get("a") == [1, 2, 3]
+    finally:
+        second.close()
+
+
+def test_max_bytes_drops_entries_closest_to_expiry(tmp_path):
+    cache = DiskCache(cache_dir=str(tmp_path), shards=1, max_bytes=300, sweep_interval=0)
+    try:
+        for i in range(10):
+            cache.set(f"key{i}", "x" * 50, ttl=60 + i)
+        assert cache.size_bytes() <= 300
+        assert cache.get("key9") is not None
+        assert cache.get("key0") is None
+    finally:
+        cache.close()
+
+
+def test_max_bytes_is_shared_by_processes_using_the_same_directory(tmp_path):
+    # Each worker process opens its own DiskCache on the shared directory
+    workers = [DiskCache(cache_dir=str(tmp_path), shards=1, max_bytes=300, sweep_interval=0) for _ in range(3)]
+    try:
+        for i in range(12):
+            workers[i % 3].set(f"key{i}", "x" * 50, ttl=60 + i)
+        for worker in workers:
+            assert 250 < worker.size_bytes() <= 300
+        assert workers[0].get("key11") is not None and workers[0].get("key6") is None
+        conn = workers[0]._conns[0]
+        assert workers[0].size_bytes() == conn.execute("SELECT SUM(LENGTH(value)) FROM cache").fetchone()[0]
+        workers[1].delete("key11")
+        workers[2].set("key10", "x" * 10, ttl=3600)
+        assert workers[0].size_bytes() == conn.execute("SELECT SUM(LENGTH(value)) FROM cache").fetchone()[0]
+    finally:
+        for worker in workers:
+            worker.close()
+
+
+def test_size_of_entries_written_before_size_tracking_is_counted(tmp_path):
+    conn = sqlite3.connect(tmp_path / "shard-00.sqlite")
+    conn.execute(
+        "CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, size INTEGER NOT NULL)"
+    )
+    conn.execute("INSERT INTO cache VALUES ('a', '\"xyz\"', ?, 5)", (time.time() + 60,))
+    conn.commit()
+    conn.close()
+    cache = DiskCache(cache_dir=str(tmp_path), shards=1, sweep_interval=0)
+    try:
+        assert cache.size_bytes() == 5
+        assert cache.get("a") == "xyz"
+        cache.set("a", "xy")
+        assert cache.size_bytes() == 4
+    finally:
+        cache.close()
+
+
+def test_clear(cache):
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.items() == []
+    assert cache.size_bytes() == 0
+
+
+def test_async_interface(cache):
+    async def main():
+        await cache.aset("a", {"v": 1})
+        assert await cache.aget("a") == {"v": 1}
+        assert await cache.adelete("a") is True
+        await cache.aclear()
+
+    asyncio.run(main())
+
+
+def test_files_are_private(tmp_path):
+    cache_dir = tmp_path / "store"
+    cache = DiskCache(cache_dir=str(cache_dir), shards=2, sweep_interval=0)
+    cache.set("a", {"v": 1})
+    cache.close()
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    for path in cache_dir.iterdir():
+        assert path.stat().st_mode & 0o077 == 0, path
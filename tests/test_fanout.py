@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from utilities.fanout import fan_out
+
+
+def test_concurrency_is_bounded_and_duplicates_run_once():
+    running = []
+    peak = []
+
+    async def fn(item):
+        running.append(item)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(item)
+        return item * 2
+
+    results = asyncio.run(fan_out([1, 2, 3, 4, 5, 6, 1], fn, limit=2))
+    assert max(peak) == 2
+    assert len(peak) == 6
+    assert results == {item: {"ok": True, "result": item * 2} for item in range(1, 7)}
+
+
+def test_errors_are_reported_per_item():
+    async def fn(region):
+        if region == "bad":
+            raise ValueError("unknown region")
+        return region.upper()
+
+    progress = []
+
+    async def on_result(item, outcome, done, total):
+        progress.append((done, total))
+
+    results = asyncio.run(fan_out(["a", "bad", "b"], fn, on_result=on_result))
+    assert results["bad"] == {"ok": False, "error": "ValueError: unknown region"}
+    assert results["a"] == {"ok": True, "result": "A"}
+    assert results["b"] == {"ok": True, "result": "B"}
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_cancelling_fan_out_cancels_running_calls():
+    cancelled = []
+
+    async def fn(item):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    async def main():
+        task = asyncio.create_task(fan_out(range(4), fn, limit=2))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return len(asyncio.all_tasks())
+
+    assert asyncio.run(main()) == 1
+    assert sorted(cancelled) == [0, 1]
+
+
+def test_on_result_errors_stop_the_remaining_calls():
+    started = []
+
+    async def fn(item):
+        started.append(item)
+        await asyncio.sleep(0 if item == 0 else 10)
+        return item
+
+    async def on_result(item, outcome, done, total):
+        raise RuntimeError("client went away")
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await fan_out(range(4), fn, limit=2, on_result=on_result)
+        return len(asyncio.all_tasks())
+
+    assert asyncio.run(main()) == 1
+    assert 3 not in started
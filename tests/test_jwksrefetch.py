@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from authlib.jose import JsonWebKey  # noqa: E402
+
+from ociprovider import OCIJWTVerifier  # noqa: E402
+
+JWKS_URI = "http://iam.test/admin/v1/SigningCert/jwk"
+
+
+def _verifier(min_refetch_interval=30, **kwargs):
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+    jwks = {"keys": [{**key.as_dict(is_private=False), "kid": "current"}]}
+    fetches = []
+
+    async def handler(request):
+        fetches.append(request.url)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=jwks)
+
+    verifier = OCIJWTVerifier(
+        jwks_uri=JWKS_URI,
+        min_refetch_interval=min_refetch_interval,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs,
+    )
+    return verifier, fetches
+
+
+def test_concurrent_unknown_kids_fetch_once():
+    async def main():
+        verifier, fetches = _verifier()
+        results = await asyncio.gather(
+            *(verifier._get_jwks_key("unknown") for _ in range(10)), return_exceptions=True
+        )
+        await verifier.aclose()
+        return results, fetches
+
+    results, fetches = asyncio.run(main())
+    assert len(fetches) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_known_kid_found_after_refetch():
+    async def main():
+        verifier, fetches = _verifier()
+        key = await verifier._get_jwks_key("current")
+        again = await verifier._get_jwks_key("current")
+        await verifier.aclose()
+        return key, again, fetches
+
+    key, again, fetches = asyncio.run(main())
+    assert key is not None and again is key
+    assert len(fetches) == 1
+
+
+def test_background_refresh_ignores_rate_limit():
+    async def main():
+        verifier, fetches = _verifier()
+        await verifier.refresh_keys()
+        await verifier.refresh_keys()
+        await verifier.refresh_keys(min_interval=30)
+        return fetches
+
+    assert len(asyncio.run(main())) == 2
+
+
+class DictStore:
+    """In-memory stand-in for the persistent discovery/JWKS cache"""
+
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    def get(self, key):
+        return self.data.get(key)
+
+    async def aset(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+def test_keys_from_the_persistent_cache_are_refetched_right_away():
+    from ociprovider import _jwks_cache_key
+
+    stale = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+    store = DictStore({_jwks_cache_key(JWKS_URI): {"keys": [{**stale.as_dict(is_private=False), "kid": "rotated"}]}})
+
+    async def main():
+        verifier, fetches = _verifier(store=store, refresh_interval=3600)
+        assert verifier._lookup_key("rotated") is not None
+        assert await verifier.warm_up() is True
+        await asyncio.sleep(0.1)
+        await verifier.aclose()
+        return verifier, fetches
+
+    verifier, fetches = asyncio.run(main())
+    assert len(fetches) == 1
+    assert verifier._lookup_key("rotated") is None
+    assert verifier._lookup_key("current") is not None
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from utilities.keyvalue import DiskKeyValue, build_client_storage  # noqa: E402
+
+
+def test_disk_put_without_ttl_never_expires(tmp_path):
+    async def main():
+        store = DiskKeyValue(cache_dir=str(tmp_path), sweep_interval=0)
+        await store.put("client", {"id": "a"})
+        await store.put("state", {"id": "b"}, ttl=60)
+        return await store.ttl("client"), await store.ttl("state")
+
+    (value, ttl), (_, state_ttl) = asyncio.run(main())
+    assert value == {"id": "a"}
+    assert ttl is None
+    assert 0 < state_ttl <= 60
+
+
+def test_client_storage_is_encrypted_on_disk(tmp_path):
+    async def main():
+        store = build_client_storage("disk", cache_dir=str(tmp_path), encryption_secret="storage-secret")
+        await store.put("token", {"access_token": "upstream-secret-token"}, collection="tokens")
+        return await store.get("token", collection="tokens")
+
+    assert asyncio.run(main()) == {"access_token": "upstream-secret-token"}
+    stored = b"".join(path.read_bytes() for path in tmp_path.iterdir())
+    assert b"upstream-secret-token" not in stored
+
+
+def test_client_storage_with_another_key_reads_missing(tmp_path):
+    async def main():
+        writer = build_client_storage("disk", cache_dir=str(tmp_path / "a"), encryption_secret="first-secret")
+        await writer.put("token", {"access_token": "x"})
+        writer.key_value.disk_cache.close()
+        reader = build_client_storage("disk", cache_dir=str(tmp_path / "a"), encryption_secret="second-secret")
+        return await reader.get("token")
+
+    assert asyncio.run(main()) is None
+
+
+def test_client_storage_requires_secret(tmp_path):
+    with pytest.raises(ValueError):
+        build_client_storage("disk", cache_dir=str(tmp_path))
@@ -0,0 +1,80 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from utilities.logpipeline import (  # noqa: E402
+    DeferredQueueHandler,
+    configure_logging,
+    jti_var,
+    request_id_var,
+    shutdown_logging,
+)
+
+
+class FormattedOn:
+    """Argument recording which thread turned it into text"""
+
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread().name
+        return "value"
+
+
+def _lines(stream) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_go_through_the_queue_as_json_and_are_flushed_on_shutdown():
+    stream = io.StringIO()
+    configure_logging("DEBUG", stream=stream, rate_limit=0, logger_name="test.logpipeline")
+    logger = logging.getLogger("test.logpipeline.module")
+    assert any(isinstance(handler, DeferredQueueHandler) for handler in logging.getLogger("test.logpipeline").handlers)
+
+    argument = FormattedOn()
+    request_token = request_id_var.set("req-1")
+    jti_token = jti_var.set("jti-1")
+    try:
+        logger.info("Exchanged token for %s", argument)
+    finally:
+        request_id_var.reset(request_token)
+        jti_var.reset(jti_token)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Token exchange failed")
+    shutdown_logging()
+
+    info, error = _lines(stream)
+    assert info["msg"] == "Exchanged token for value"
+    assert info["level"] == "INFO"
+    assert info["logger"] == "test.logpipeline.module"
+    assert info["request_id"] == "req-1" and info["jti"] == "jti-1"
+    assert info["ts"].endswith("Z")
+    assert "jti" not in error and "ValueError: boom" in error["exc"]
+    # Formatting happened on the listener thread, not the logging one
+    assert argument.thread is not None and argument.thread != threading.current_thread().name
+
+
+def test_repeated_info_messages_are_rate_limited_but_warnings_are_not():
+    stream = io.StringIO()
+    configure_logging("INFO", stream=stream, rate_limit=5, logger_name="test.logpipeline")
+    logger = logging.getLogger("test.logpipeline")
+    for i in range(50):
+        logger.info("Cache hit for %s", i)
+        logger.warning("Upstream slow for %s", i)
+    logger.debug("Not at the configured level")
+    shutdown_logging()
+
+    lines = _lines(stream)
+    infos = [line for line in lines if line["level"] == "INFO"]
+    warnings = [line for line in lines if line["level"] == "WARNING"]
+    assert 5 <= len(infos) < 10
+    assert len(warnings) == 50
+    assert not any(line["level"] == "DEBUG" for line in lines)
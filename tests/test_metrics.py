@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from benchmarks.fake_iam import FakeIAM  # noqa: E402
+from ociprovider import OCIProvider, _discovery_cache_key  # noqa: E402
+from utilities.diskcache import DiskCache  # noqa: E402
+from utilities.metrics import MetricsRegistry, cache_stats_callback, labelled_stats_callback  # noqa: E402
+from utilities.ttlcache import TTLCache  # noqa: E402
+
+IAM_URL = "http://iam.test"
+CONFIG_URL = f"{IAM_URL}/.well-known/openid-configuration"
+
+
+def _samples(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#"))
+
+
+def test_render_counters_gauges_and_histograms():
+    registry = MetricsRegistry()
+    errors = registry.counter("errors_total", "Errors", ("error",))
+    errors.inc(error='bad "quote"')
+    errors.inc(2, error='bad "quote"')
+    in_flight = registry.gauge("in_flight", "In flight")
+    with in_flight.track_inprogress():
+        in_flight.inc()
+    latency = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, stage="exchange")
+    # A metric registered twice keeps its values
+    assert registry.counter("errors_total", "Errors", ("error",)) is errors
+
+    text = registry.render()
+    assert "# HELP errors_total Errors\n# TYPE errors_total counter\n" in text
+    assert "# TYPE latency_seconds histogram" in text
+    assert _samples(text) == {
+        'errors_total{error="bad \\"quote\\""}': "3",
+        "in_flight": "1",
+        'latency_seconds_bucket{stage="exchange",le="0.1"}': "1",
+        'latency_seconds_bucket{stage="exchange",le="1.0"}': "2",
+        'latency_seconds_bucket{stage="exchange",le="+Inf"}': "3",
+        'latency_seconds_sum{stage="exchange"}': "5.55",
+        'latency_seconds_count{stage="exchange"}': "3",
+    }
+
+
+def test_cache_stats_are_flattened_and_failing_callbacks_skipped():
+    cache = TTLCache(max_size=4)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    class Tiered:
+        def stats(self):
+            return {"l1": cache.stats(), "l2": {"hits": 2}, "open": True}
+
+    def broken():
+        raise RuntimeError("stats unavailable")
+
+    registry = MetricsRegistry()
+    registry.callback("broken", "Broken", broken)
+    registry.callback("cache_stats", "Caches", cache_stats_callback({"signer": Tiered()}))
+    samples = _samples(registry.render())
+    assert samples['cache_stats{cache="signer",field="l1_hits"}'] == "1"
+    assert samples['cache_stats{cache="signer",field="l1_misses"}'] == "1"
+    assert samples['cache_stats{cache="signer",field="l2_hits"}'] == "2"
+    assert not any("open" in name or name.startswith("broken") for name in samples)
+
+
+def test_auth_and_upstream_stats_of_the_provider(tmp_path):
+    fake = FakeIAM(IAM_URL)
+    discovery = json.loads(asyncio.run(fake.discovery(None)).body)
+    fake.requests.clear()
+    store = DiskCache(cache_dir=str(tmp_path))
+    store.set(_discovery_cache_key(CONFIG_URL), discovery)
+    store.close()
+
+    async def main():
+        auth = OCIProvider(
+            config_url=CONFIG_URL,
+            client_id="fake-client",
+            client_secret="fake-secret",
+            base_url="http://127.0.0.1:8000",
+            jwt_signing_key="test-key",
+            cache_dir=str(tmp_path),
+            verified_token_cache_size=16,
+        )
+        # Send the provider's IAM requests to the fake domain
+        auth._upstream_pool._transport = httpx.ASGITransport(fake.app())
+        registry = MetricsRegistry()
+        registry.callback("auth_stats", "Auth", labelled_stats_callback(auth.token_cache_stats, "field"))
+        registry.callback("upstream_stats", "Upstream", labelled_stats_callback(auth.upstream_stats, "endpoint", "field"))
+        assert await auth.warm_up() is True
+        token = fake.issue("user", "fake-client")
+        for _ in range(3):
+            assert await auth._oci_token_verifier.load_access_token(token) is not None
+        text = registry.render()
+        await auth.aclose()
+        return text
+
+    samples = _samples(asyncio.run(main()))
+    assert samples['auth_stats{field="hits"}'] == "2"
+    assert samples['auth_stats{field="misses"}'] == "1"
+    assert float(samples['auth_stats{field="hit_rate"}']) == pytest.approx(2 / 3)
+    assert samples['upstream_stats{endpoint="/admin/v1/SigningCert/jwk",field="requests"}'] == "1"
+    assert samples['upstream_stats{endpoint="/admin/v1/SigningCert/jwk",field="errors"}'] == "0"
+    assert fake.requests == {"jwks": 1}
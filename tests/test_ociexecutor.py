@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+from utilities.ociexecutor import ExecutorBusy, OCIExecutor
+
+
+def test_kwargs_including_timeout_reach_the_call():
+    def call(region, timeout=None):
+        return region, timeout
+
+    async def main():
+        executor = OCIExecutor(max_workers=1, max_queue=0)
+        try:
+            return await executor.run(call, "us-ashburn-1", timeout=(5, 60))
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(main()) == ("us-ashburn-1", (5, 60))
+
+
+def test_calls_beyond_the_queue_bound_are_rejected():
+    release = threading.Event()
+
+    async def main():
+        executor = OCIExecutor(max_workers=1, max_queue=1)
+        try:
+            running = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with pytest.raises(ExecutorBusy):
+                await executor.run(release.wait)
+            release.set()
+            assert await asyncio.gather(*running) == [True, True]
+            # Slots are released once calls finish
+            assert await executor.run(release.wait) is True
+            return executor.stats()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    stats = asyncio.run(main())
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 3
+    assert stats["pending"] == 0
+
+
+def test_slow_calls_time_out_and_queued_calls_are_dropped():
+    release = threading.Event()
+    started = []
+
+    def slow(name):
+        started.append(name)
+        release.wait(5)
+
+    async def main():
+        executor = OCIExecutor(max_workers=1, max_queue=1, timeout=0.05)
+        try:
+            results = await asyncio.gather(
+                executor.run(slow, "running"), executor.run(slow, "queued"), return_exceptions=True
+            )
+            assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+            # A per-call run_timeout overrides the executor's
+            release.set()
+            await executor.run(slow, "after", run_timeout=1)
+            return executor.stats()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    stats = asyncio.run(main())
+    assert stats["timed_out"] == 2
+    assert started == ["running", "after"]
+    assert stats["pending"] == 0
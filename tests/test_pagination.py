@@ -0,0 +1,96 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.pagination import MAX_LIMIT, compact, list_page
+
+BUCKETS = [
+    SimpleNamespace(name=f"bucket-{i}", time_created=datetime.datetime(2024, 1, 1, i), etag=None, secret="x")
+    for i in range(7)
+]
+
+
+class InvalidPage(Exception):
+    """Stand-in for the ServiceError OCI raises on an unknown page token"""
+
+
+class Listing:
+    """Paginated list call over BUCKETS with OCI's page tokens and a server-side page cap"""
+
+    def __init__(self, page_cap: int = 3):
+        self.page_cap = page_cap
+        self.calls = []
+
+    def list_buckets(self, namespace, compartment_id, page=None, limit=None):
+        self.calls.append((page, limit))
+        if page is not None and not page.startswith("offset-"):
+            raise InvalidPage(page)
+        start = int(page.removeprefix("offset-")) if page else 0
+        end = min(start + min(limit, self.page_cap), len(BUCKETS))
+        has_next = end < len(BUCKETS)
+        return SimpleNamespace(
+            data=BUCKETS[start:end], has_next_page=has_next, next_page=f"offset-{end}" if has_next else None
+        )
+
+
+async def call(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def _page(listing, **kwargs):
+    return asyncio.run(
+        list_page(call, listing.list_buckets, "ns", "ocid1.compartment", fields=("name", "time_created", "etag"), **kwargs)
+    )
+
+
+def test_compact_keeps_only_requested_fields():
+    assert compact(BUCKETS[1], ("name", "time_created", "etag")) == {
+        "name": "bucket-1",
+        "time_created": "2024-01-01T01:00:00",
+    }
+
+
+def test_cursor_round_trip_visits_every_record_once():
+    listing = Listing()
+    names = []
+    cursor = None
+    while True:
+        page = _page(listing, cursor=cursor, limit=4)
+        assert page["count"] == len(page["items"]) <= 4
+        names.extend(item["name"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert names == [bucket.name for bucket in BUCKETS]
+    # Pages ask only for what is left of the limit
+    assert listing.calls == [(None, 4), ("offset-3", 1), ("offset-4", 4)]
+
+
+def test_last_page_has_no_cursor():
+    listing = Listing()
+    page = _page(listing, cursor="offset-5", limit=10)
+    assert [item["name"] for item in page["items"]] == ["bucket-5", "bucket-6"]
+    assert page["next_cursor"] is None
+    assert listing.calls == [("offset-5", 10)]
+
+
+def test_exact_limit_returns_the_cursor_of_the_next_record():
+    page = _page(Listing(), limit=3)
+    assert page["count"] == 3
+    assert page["next_cursor"] == "offset-3"
+
+
+def test_invalid_cursor_reaches_the_caller():
+    listing = Listing()
+    with pytest.raises(InvalidPage):
+        _page(listing, cursor="not-a-cursor")
+    assert listing.calls == [("not-a-cursor", 100)]
+
+
+def test_limit_is_clamped():
+    listing = Listing(page_cap=MAX_LIMIT)
+    assert _page(listing, limit=0)["count"] == 1
+    _page(listing, limit=MAX_LIMIT * 10)
+    assert listing.calls[-1] == (None, MAX_LIMIT)
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from utilities.readiness import Readiness, prefetch_jwks  # noqa: E402
+
+
+class KeyedVerifier:
+    def __init__(self):
+        self.lookups = []
+        self._jwks_cache = {}
+
+    async def _get_jwks_key(self, kid):
+        self.lookups.append(kid)
+        self._jwks_cache = {"a": object(), "b": object()}
+        raise ValueError("several keys and no kid")
+
+
+def test_prefetch_without_verifier_has_nothing_to_do():
+    assert asyncio.run(prefetch_jwks(None)) is True
+    assert asyncio.run(prefetch_jwks(object())) is True
+
+
+def test_prefetch_loads_jwks_through_key_lookup():
+    verifier = KeyedVerifier()
+    assert asyncio.run(prefetch_jwks(verifier)) is True
+    assert verifier.lookups == [None]
+
+
+def test_prefetch_fails_when_jwks_cannot_be_fetched():
+    from fastmcp.server.auth.providers.jwt import JWTVerifier
+
+    verifier = JWTVerifier(jwks_uri="http://127.0.0.1:1/jwks")
+    assert asyncio.run(prefetch_jwks(verifier)) is False
+    assert verifier._jwks_cache == {}
+
+
+def test_jwks_step_is_done_without_verifier():
+    async def main():
+        readiness = Readiness()
+        readiness.add_step("jwks", lambda: prefetch_jwks(None))
+        readiness.start()
+        await readiness._task
+        return readiness.check()
+
+    ready, status = asyncio.run(main())
+    assert ready and status["jwks"]["done"]
@@ -0,0 +1,104 @@
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+
+pytest.importorskip("oci")
+fakeredis = pytest.importorskip("fakeredis")
+
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+from utilities.encryption import storage_fernet  # noqa: E402
+from utilities.rediscache import KEY_PREFIX, AsyncRedisTokenCache  # noqa: E402
+from utilities.ttlcache import TTLCache  # noqa: E402
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+class ExchangedSigner:
+    """Holds a UPST and session key the way TokenExchangeSigner does"""
+
+    def __init__(self, exp: float, sub: str = "user"):
+        self.upst = f"{_segment({'alg': 'RS256'})}.{_segment({'sub': sub, 'exp': exp})}.sig"
+        self.api_key = "ST$" + self.upst
+        self.private_key = PRIVATE_KEY
+
+
+class CountingRedis(fakeredis.aioredis.FakeRedis):
+    """FakeRedis counting the commands the cache issues directly"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = {"mget": 0, "set": 0}
+
+    async def mget(self, *args, **kwargs):
+        self.calls["mget"] += 1
+        return await super().mget(*args, **kwargs)
+
+    async def set(self, *args, **kwargs):
+        self.calls["set"] += 1
+        return await super().set(*args, **kwargs)
+
+
+def _signers(count: int) -> dict:
+    return {f"jti-{i}": ExchangedSigner(exp=time.time() + 600, sub=f"user-{i}") for i in range(count)}
+
+
+def test_set_many_pipelines_and_get_many_uses_one_mget():
+    signers = _signers(5)
+
+    async def main():
+        client = CountingRedis()
+        cache = AsyncRedisTokenCache(client=client)
+        await cache.set_many({**signers, "expired": ExchangedSigner(exp=time.time() - 1)})
+        assert client.calls["set"] == 0
+        assert await client.exists(f"{KEY_PREFIX}expired") == 0
+        ttl = await client.ttl(f"{KEY_PREFIX}jti-0")
+        assert 0 < ttl <= 600
+        loaded = await cache.get_many([*signers, "missing"])
+        assert client.calls["mget"] == 1
+        return loaded
+
+    loaded = asyncio.run(main())
+    assert sorted(loaded) == sorted(signers)
+    assert all(loaded[tokenID].api_key == signer.api_key for tokenID, signer in signers.items())
+
+
+def test_get_many_skips_entries_that_fail_to_decrypt():
+    signers = _signers(2)
+
+    async def main():
+        server = fakeredis.FakeServer()
+        writer = AsyncRedisTokenCache(client=fakeredis.aioredis.FakeRedis(server=server), fernet=storage_fernet("secret-1"))
+        await writer.set_many(signers)
+        assert (await writer.get_many(list(signers))).keys() == signers.keys()
+        reader = AsyncRedisTokenCache(client=fakeredis.aioredis.FakeRedis(server=server), fernet=storage_fernet("secret-2"))
+        return await reader.get_many(list(signers)), await writer.get_many([])
+
+    other_key, empty = asyncio.run(main())
+    assert other_key == {} and empty == {}
+
+
+def test_warmup_loads_in_batches():
+    signers = _signers(5)
+
+    async def main():
+        client = CountingRedis()
+        cache = AsyncRedisTokenCache(client=client)
+        await cache.set_many(signers)
+        await client.set("unrelated", "value")
+        ttl_cache = TTLCache(max_size=16)
+        loaded = await cache.warmup(ttl_cache, batch_size=2)
+        return loaded, ttl_cache, client.calls["mget"]
+
+    loaded, ttl_cache, mgets = asyncio.run(main())
+    assert loaded == 5
+    assert mgets == 3
+    assert all(ttl_cache.get(tokenID) is not None for tokenID in signers)
+    assert ttl_cache.get("unrelated") is None
@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+import utilities.responsecache as responsecache  # noqa: E402
+from utilities.responsecache import ResponseCache  # noqa: E402
+
+
+@pytest.fixture
+def caller(monkeypatch):
+    """Set the claims of the calling user's access token"""
+    claims = {}
+    monkeypatch.setattr(responsecache, "get_access_token", lambda: SimpleNamespace(claims=claims))
+
+    def login(sub, tenant=None):
+        claims.clear()
+        claims.update({"iss": "https://idcs.test", "sub": sub, "tenant": tenant})
+
+    return login
+
+
+def _counting_tool(cache, **options):
+    calls = []
+
+    @cache.cached(**options)
+    async def list_things(region: str):
+        calls.append(region)
+        return {"region": region, "call": len(calls), "items": ["a"]}
+
+    return list_things, calls
+
+
+def test_principal_scope_is_per_user(caller):
+    async def main():
+        tool, calls = _counting_tool(ResponseCache(), ttl=60, scope="principal")
+        caller("alice", tenant="acme")
+        first = await tool("us-ashburn-1")
+        assert await tool("us-ashburn-1") == first
+        caller("bob", tenant="acme")
+        assert (await tool("us-ashburn-1"))["call"] == 2
+        assert len(calls) == 2
+
+    asyncio.run(main())
+
+
+def test_tenancy_scope_is_shared_within_a_tenant_only(caller):
+    async def main():
+        tool, calls = _counting_tool(ResponseCache(), ttl=60, scope="tenancy")
+        caller("alice", tenant="acme")
+        await tool("us-ashburn-1")
+        caller("bob", tenant="acme")
+        assert (await tool("us-ashburn-1"))["call"] == 1
+        caller("carol", tenant="other")
+        assert (await tool("us-ashburn-1"))["call"] == 2
+        # Arguments are part of the key
+        assert (await tool("eu-frankfurt-1"))["call"] == 3
+
+    asyncio.run(main())
+
+
+def test_callers_cannot_mutate_cached_values(caller):
+    async def main():
+        tool, _ = _counting_tool(ResponseCache(), ttl=60)
+        caller("alice")
+        miss = await tool("us-ashburn-1")
+        miss["items"].append("mutated")
+        hit = await tool("us-ashburn-1")
+        hit["items"].append("mutated")
+        assert (await tool("us-ashburn-1"))["items"] == ["a"]
+
+    asyncio.run(main())
+
+
+def test_stale_value_is_served_while_refreshing(caller):
+    async def main():
+        cache = ResponseCache()
+        tool, calls = _counting_tool(cache, ttl=0.05, stale_ttl=60)
+        caller("alice")
+        assert (await tool("us-ashburn-1"))["call"] == 1
+        await asyncio.sleep(0.1)
+        stale = await asyncio.gather(tool("us-ashburn-1"), tool("us-ashburn-1"))
+        assert [value["call"] for value in stale] == [1, 1]
+        assert cache.stats()["stale_hits"] == 2
+        await asyncio.gather(*cache._tasks)
+        # One background refresh despite two stale hits
+        assert len(calls) == 2
+        assert (await tool("us-ashburn-1"))["call"] == 2
+
+    asyncio.run(main())
+
+
+def test_bypass_and_invalidate_caller(caller):
+    async def main():
+        cache = ResponseCache()
+        tool, calls = _counting_tool(cache, ttl=60)
+        caller("alice")
+        await tool("us-ashburn-1")
+        with cache.bypass():
+            assert (await tool("us-ashburn-1"))["call"] == 2
+        assert (await tool("us-ashburn-1"))["call"] == 1
+        assert cache.invalidate_caller("list_things") == 1
+        assert (await tool("us-ashburn-1"))["call"] == 3
+
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+
+pytest.importorskip("fastmcp")
+pytest.importorskip("oci")
+
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+from utilities.diskcache import DiskCache  # noqa: E402
+from utilities.encryption import storage_fernet  # noqa: E402
+from utilities.tieredcache import DiskSignerStore  # noqa: E402
+from utilities.ttlcache import TTLCache  # noqa: E402
+
+
+def _segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+class ExchangedSigner:
+    """Holds a UPST and session key the way TokenExchangeSigner does"""
+
+    def __init__(self, exp: float):
+        self.upst = f"{_segment({'alg': 'RS256'})}.{_segment({'sub': 'user', 'exp': exp})}.sig"
+        self.api_key = "ST$" + self.upst
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def test_encrypted_store_round_trips_without_plaintext_on_disk(tmp_path):
+    signer = ExchangedSigner(exp=time.time() + 600)
+
+    async def main():
+        store = DiskSignerStore(DiskCache(cache_dir=str(tmp_path), sweep_interval=0), fernet=storage_fernet("secret-1"))
+        await store.set("jti", signer)
+        loaded = await store.get("jti")
+        cache = TTLCache(max_size=8)
+        warmed = await store.warmup(cache)
+        store.disk_cache.close()
+        return loaded, warmed, cache
+
+    loaded, warmed, cache = asyncio.run(main())
+    assert loaded.api_key == signer.api_key
+    assert warmed == 1 and cache.get("jti") is not None
+    stored = b"".join(path.read_bytes() for path in tmp_path.iterdir())
+    assert signer.upst.encode() not in stored
+    assert b"PRIVATE KEY" not in stored
+
+
+def test_entries_from_another_key_read_as_missing(tmp_path):
+    signer = ExchangedSigner(exp=time.time() + 600)
+
+    async def main():
+        writer = DiskSignerStore(DiskCache(cache_dir=str(tmp_path), sweep_interval=0), fernet=storage_fernet("secret-1"))
+        await writer.set("jti", signer)
+        writer.disk_cache.close()
+        reader = DiskSignerStore(DiskCache(cache_dir=str(tmp_path), sweep_interval=0), fernet=storage_fernet("secret-2"))
+        return await reader.get("jti"), await reader.warmup(TTLCache(max_size=8))
+
+    assert asyncio.run(main()) == (None, 0)
+
+
+def test_redis_store_encrypts_values():
+    fakeredis = pytest.importorskip("fakeredis")
+    from utilities.rediscache import KEY_PREFIX, AsyncRedisTokenCache
+
+    signer = ExchangedSigner(exp=time.time() + 600)
+
+    async def main():
+        client = fakeredis.FakeAsyncRedis()
+        store = AsyncRedisTokenCache(client=client, fernet=storage_fernet("secret-1"))
+        await store.set("jti", signer)
+        return await store.get("jti"), await client.get(f"{KEY_PREFIX}jti")
+
+    loaded, raw = asyncio.run(main())
+    assert loaded.api_key == signer.api_key
+    assert signer.upst.encode() not in raw
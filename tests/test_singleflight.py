@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utilities.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def exchange():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "signer"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("jti", exchange)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("jti", exchange))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+    assert results == ["signer"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"executions": 1, "deduplicated": 4, "in_flight": 0}
+
+
+def test_errors_are_shared_and_not_cached():
+    async def main():
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("IAM unavailable")
+
+        outcomes = await asyncio.gather(*(flight.do_async("jti", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert flight.stats()["executions"] == 1
+        assert await flight.do_async("jti", lambda: "signer") == "signer"
+
+    asyncio.run(main())
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    async def main():
+        flight = SingleFlight()
+        calls = []
+
+        async def exchange():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "signer"
+
+        leader = asyncio.create_task(flight.do_async("jti", exchange))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do_async("jti", exchange))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == "signer"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert len(calls) == 1
+
+    asyncio.run(main())
+
+
+def test_cancelled_follower_does_not_fail_leader():
+    async def main():
+        flight = SingleFlight()
+
+        async def exchange():
+            await asyncio.sleep(0.05)
+            return "signer"
+
+        leader = asyncio.create_task(flight.do_async("jti", exchange))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do_async("jti", exchange))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        assert await leader == "signer"
+
+    asyncio.run(main())
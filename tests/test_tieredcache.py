@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastmcp")
+fakeredis = pytest.importorskip("fakeredis")
+
+from utilities.tieredcache import TieredSignerCache  # noqa: E402
+from utilities.ttlcache import TTLCache  # noqa: E402
+
+
+class DictStore:
+    """In-memory stand-in for an L2 signer store"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, tokenID):
+        return self.data.get(tokenID)
+
+    async def set(self, tokenID, signer, expires_at=None):
+        self.data[tokenID] = signer
+
+    async def delete(self, tokenID):
+        return self.data.pop(tokenID, None) is not None
+
+    async def warmup(self, cache):
+        for tokenID, signer in self.data.items():
+            cache.set(tokenID, signer)
+        return len(self.data)
+
+
+class Signer:
+    pass
+
+
+def test_l1_hit_does_not_touch_l2():
+    async def main():
+        l2 = DictStore()
+        cache = TieredSignerCache(TTLCache(max_size=8), l2)
+        signer = Signer()
+        await cache.set("jti", signer)
+        l2.data.clear()
+        assert await cache.get("jti") is signer
+        assert cache.stats()["l2"]["hits"] + cache.stats()["l2"]["misses"] == 0
+
+    asyncio.run(main())
+
+
+def test_l2_hit_backfills_l1():
+    async def main():
+        l2 = DictStore()
+        l1 = TTLCache(max_size=8)
+        cache = TieredSignerCache(l1, l2)
+        signer = Signer()
+        l2.data["jti"] = signer
+        assert await cache.get("jti") is signer
+        assert l1.get("jti") is signer
+        assert await cache.get("other") is None
+        stats = cache.stats()
+        assert stats["l2"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert stats["l1"]["hits"] == 1
+
+    asyncio.run(main())
+
+
+def test_set_writes_through_and_invalidate_removes_both_tiers():
+    async def main():
+        l2 = DictStore()
+        cache = TieredSignerCache(TTLCache(max_size=8), l2)
+        await cache.set("jti", Signer())
+        assert "jti" in l2.data
+        await cache.invalidate("jti")
+        assert await cache.get("jti") is None
+        assert l2.data == {}
+
+    asyncio.run(main())
+
+
+def test_l2_errors_fall_back_to_a_miss():
+    class BrokenStore(DictStore):
+        async def get(self, tokenID):
+            raise ConnectionError("L2 down")
+
+    async def main():
+        cache = TieredSignerCache(TTLCache(max_size=8), BrokenStore())
+        assert await cache.get("jti") is None
+
+    asyncio.run(main())
+
+
+def test_warm_up_loads_l2_into_l1():
+    async def main():
+        l2 = DictStore()
+        l2.data = {"a": Signer(), "b": Signer()}
+        l1 = TTLCache(max_size=8)
+        assert await TieredSignerCache(l1, l2).warm_up() == 2
+        assert sorted(l1.keys()) == ["a", "b"]
+
+    asyncio.run(main())
+
+
+def test_invalidation_reaches_other_replicas():
+    async def main():
+        server = fakeredis.FakeServer()
+        l2 = DictStore()
+        replicas = [
+            TieredSignerCache(TTLCache(max_size=8), l2, redis_client=fakeredis.aioredis.FakeRedis(server=server))
+            for _ in range(2)
+        ]
+        for replica in replicas:
+            await replica.start()
+        try:
+            for replica in replicas:
+                await replica.set("jti", Signer())
+            await replicas[0].invalidate("jti")
+            for _ in range(50):
+                if replicas[1].invalidations_received:
+                    break
+                await asyncio.sleep(0.01)
+            assert replicas[1].l1.get("jti") is None
+            assert replicas[1].invalidations_received == 1
+        finally:
+            for replica in replicas:
+                await replica.stop()
+
+    asyncio.run(main())
+
+
+class FailingStore(DictStore):
+    async def delete(self, tokenID):
+        raise ConnectionError("L2 is down")
+
+
+def test_invalidate_is_best_effort_when_redis_is_down():
+    async def main():
+        server = fakeredis.FakeServer()
+        cache = TieredSignerCache(
+            TTLCache(max_size=8), FailingStore(), redis_client=fakeredis.aioredis.FakeRedis(server=server)
+        )
+        cache.l1.set("jti", Signer())
+        server.connected = False
+        await cache.invalidate("jti")
+        assert cache.l1.get("jti") is None
+
+    asyncio.run(main())
+
+
+def test_listener_resubscribes_after_the_connection_drops():
+    async def main():
+        server = fakeredis.FakeServer()
+        publisher = TieredSignerCache(TTLCache(max_size=8), redis_client=fakeredis.aioredis.FakeRedis(server=server))
+        listener = TieredSignerCache(
+            TTLCache(max_size=8), redis_client=fakeredis.aioredis.FakeRedis(server=server), reconnect_delay=0.01
+        )
+        await listener.start()
+        try:
+            server.connected = False
+            await asyncio.sleep(0.05)
+            server.connected = True
+            for _ in range(100):
+                if listener.reconnects:
+                    break
+                await asyncio.sleep(0.01)
+            assert listener.reconnects == 1
+            listener.l1.set("jti", Signer())
+            await publisher.invalidate("jti")
+            for _ in range(50):
+                if listener.invalidations_received:
+                    break
+                await asyncio.sleep(0.01)
+            assert listener.l1.get("jti") is None
+        finally:
+            await listener.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from utilities.tokenrefresher import TokenRefresher  # noqa: E402
+from utilities.ttlcache import TTLCache  # noqa: E402
+
+
+def _refresher(refreshed: list, signer_exp: float):
+    async def refresh(token, tokenID, token_exp):
+        refreshed.append(tokenID)
+        return signer_exp + 3600
+
+    return TokenRefresher(refresh, lambda signer: signer, lead_time=300, jitter=0)
+
+
+def test_refreshes_tokens_close_to_upst_expiry():
+    async def main():
+        refreshed = []
+        refresher = _refresher(refreshed, time.time())
+        refresher.track("due", "token", time.time() + 3600, time.time() + 60)
+        refresher.track("later", "token", time.time() + 3600, time.time() + 3600)
+        assert await refresher.run_once() == 1
+        assert refreshed == ["due"]
+
+    asyncio.run(main())
+
+
+def test_tokens_without_exp_or_expired_are_dropped():
+    async def main():
+        refreshed = []
+        refresher = _refresher(refreshed, time.time())
+        refresher.track("no_exp", "token", None, time.time() + 60)
+        refresher.track("expired", "token", time.time() - 1, time.time() + 60)
+        assert await refresher.run_once() == 0
+        assert refresher.stats()["tracked"] == 0
+
+    asyncio.run(main())
+
+
+def test_evicted_signers_are_forgotten():
+    async def main():
+        refreshed = []
+        refresher = _refresher(refreshed, time.time())
+        cache = TTLCache(max_size=1)
+
+        def forget_evicted(tokenID, signer):
+            if tokenID not in cache:
+                refresher.forget(tokenID)
+
+        cache.add_evict_listener(forget_evicted)
+        for tokenID in ("a", "b"):
+            cache.set(tokenID, object())
+            refresher.track(tokenID, "token", time.time() + 3600, time.time() + 60)
+        # Replacing a signer (as a refresh does) keeps the session tracked
+        cache.set("b", object())
+        assert await refresher.run_once() == 1
+        assert refreshed == ["b"]
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from utilities.ttlcache import TTLCache
+
+
+def test_get_set_and_counters():
+    cache = TTLCache(max_size=4)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing", "default") == "default"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_notifies_listeners():
+    evicted = []
+    cache = TTLCache(max_size=2, on_evict=lambda key, value: evicted.append(key))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert evicted == ["b"]
+    assert cache.keys() == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_at_their_deadline():
+    evicted = []
+    cache = TTLCache(max_size=4, on_evict=lambda key, value: evicted.append(key))
+    cache.set("old", 1, expires_at=time.time() - 1)
+    cache.set("new", 2, expires_at=time.time() + 60)
+    assert "old" not in cache
+    assert cache.get("old") is None
+    assert evicted == ["old"]
+    assert cache.get("new") == 2
+
+
+def test_default_ttl_and_purge_expired():
+    cache = TTLCache(max_size=4, default_ttl=-1)
+    cache.set("a", 1)
+    cache.set("b", 2, expires_at=time.time() + 60)
+    assert cache.purge_expired() == 1
+    assert cache.keys() == ["b"]
+
+
+def test_replacing_a_value_notifies_only_when_it_changes():
+    evicted = []
+    cache = TTLCache(max_size=4, on_evict=lambda key, value: evicted.append(value))
+    value = object()
+    cache.set("a", value)
+    cache.set("a", value)
+    assert evicted == []
+    cache.set("a", "other")
+    assert evicted == [value]
+
+
+def test_delete_and_clear():
+    cache = TTLCache(max_size=4)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_max_size_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(max_size=0)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from authlib.jose import JsonWebKey, jwt  # noqa: E402
+from fastmcp.server.auth.providers.jwt import JWTVerifier  # noqa: E402
+
+from ociprovider import OCIJWTVerifier  # noqa: E402
+
+ISSUER = "https://iam.test"
+KEY = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+JWKS = {"keys": [{**KEY.as_dict(is_private=False), "kid": "current"}]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time shared by the verifier and the token cache"""
+    now = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def verifications(monkeypatch):
+    """Count full (signature checking) verifications"""
+    calls = []
+    verify = JWTVerifier.load_access_token
+
+    async def counting(self, token):
+        calls.append(token)
+        return await verify(self, token)
+
+    monkeypatch.setattr(JWTVerifier, "load_access_token", counting)
+    return calls
+
+
+def _verifier(**kwargs):
+    async def handler(request):
+        return httpx.Response(200, json=JWKS)
+
+    return OCIJWTVerifier(
+        jwks_uri=f"{ISSUER}/jwk",
+        issuer=ISSUER,
+        token_cache_size=8,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs,
+    )
+
+
+def _token(exp: float, sub: str = "user") -> str:
+    claims = {"iss": ISSUER, "sub": sub, "exp": int(exp), "iat": int(time.time())}
+    return jwt.encode({"alg": "RS256", "kid": "current"}, claims, KEY).decode()
+
+
+def test_repeat_tokens_skip_verification(clock, verifications):
+    async def main():
+        verifier = _verifier()
+        token = _token(clock[0] + 600)
+        first = await verifier.load_access_token(token)
+        again = await verifier.load_access_token(token)
+        other = await verifier.load_access_token(_token(clock[0] + 600, sub="other"))
+        await verifier.aclose()
+        return verifier, first, again, other
+
+    verifier, first, again, other = asyncio.run(main())
+    assert first is not None and again is first
+    assert other is not None and other.claims["sub"] == "other"
+    assert len(verifications) == 2
+    assert verifier.token_cache_stats()["hits"] == 1
+
+
+def test_cached_tokens_do_not_outlive_their_exp(clock, verifications):
+    async def main():
+        verifier = _verifier(token_cache_default_ttl=3600)
+        token = _token(clock[0] + 60)
+        assert await verifier.load_access_token(token) is not None
+        clock[0] += 30
+        assert await verifier.load_access_token(token) is not None
+        clock[0] += 31
+        expired = await verifier.load_access_token(token)
+        await verifier.aclose()
+        return verifier, expired
+
+    verifier, expired = asyncio.run(main())
+    assert expired is None
+    # The expired token went through full verification again, and was not cached
+    assert len(verifications) == 2
+    assert verifier.token_cache_stats()["size"] == 0
+
+
+def test_invalid_tokens_are_not_cached(clock, verifications):
+    async def main():
+        verifier = _verifier()
+        forged = _token(clock[0] + 600)[:-4] + "AAAA"
+        results = [await verifier.load_access_token(forged) for _ in range(2)]
+        await verifier.aclose()
+        return results
+
+    assert asyncio.run(main()) == [None, None]
+    assert len(verifications) == 2
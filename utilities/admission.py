@@ -0,0 +1,258 @@
+import asyncio
+import collections
+import time
+
+from fastmcp.exceptions import ToolError
+from fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Overloaded(ToolError):
+    """Raised when a call is shed because the dependency is saturated"""
+
+
+class CircuitOpen(Overloaded):
+    """Raised while the circuit breaker is open"""
+
+
+def server_side_failure(exc: BaseException) -> bool:
+    """Count an error against the dependency unless it is a client error (HTTP 4xx other than 429).
+    Reads OCI ServiceError.status, or the response status of a requests/httpx HTTPError, which
+    the token exchange raises for a rejected user token."""
+    status = getattr(exc, "status", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500 and status != 429:
+        return False
+    return not isinstance(exc, ToolError)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts to the latency of the protected dependency.
+
+    The limit grows by about one per limit-many calls that finish within target_latency
+    and shrinks by the backoff factor when a call is slower or fails (AIMD). Calls over
+    the limit wait up to max_wait seconds; once as many calls are waiting as are
+    allowed in flight, new calls are rejected at once.
+    """
+
+    def __init__(self, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 64,
+                 target_latency: float = 2.0, backoff: float = 0.7, max_wait: float = 1.0):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+        self.rejected = 0
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    async def acquire(self):
+        """Take a slot or raise Overloaded"""
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= int(self.limit):
+            self.rejected += 1
+            raise Overloaded("Too many concurrent requests, try again shortly")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Overloaded("Too many concurrent requests, try again shortly") from None
+        except BaseException:
+            # Cancelled right after release() handed over the slot: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        # The slot was handed over by release()
+
+    def release(self, latency: float, ok: bool):
+        """Return a slot and adjust the limit from the call's outcome"""
+        self.in_flight -= 1
+        if ok and latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for a while.
+
+    Outcomes are kept for the last window seconds. Once at least min_calls were seen and
+    the failure ratio reaches failure_ratio, the breaker opens and calls fail fast for
+    open_seconds. After that a single probe call is let through: success closes the
+    breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_ratio: float = 0.5, min_calls: int = 10, window: float = 30,
+                 open_seconds: float = 30):
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self._outcomes: collections.deque[tuple[float, bool]] = collections.deque()
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed; marks it as the probe when half-open"""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self._opened_at < self.open_seconds:
+            return False
+        if self._probing:
+            return False
+        self.state = "half_open"
+        self._probing = True
+        return True
+
+    def cancel_probe(self):
+        """Let another call probe when the probe was not actually made"""
+        self._probing = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def record(self, ok: bool):
+        now = time.monotonic()
+        if self.state == "half_open":
+            self._probing = False
+            if ok:
+                self.state = "closed"
+                self._outcomes.clear()
+            else:
+                self._open(now)
+            return
+        self._outcomes.append((now, ok))
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+        failures = sum(1 for _, success in self._outcomes if not success)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_ratio:
+            self._open(now)
+
+    def _open(self, now: float):
+        if self.state != "open":
+            self.opened += 1
+        self.state = "open"
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def stats(self) -> dict:
+        failures = sum(1 for _, success in self._outcomes if not success)
+        return {
+            "open": int(self.state != "closed"),
+            "opened": self.opened,
+            "window_calls": len(self._outcomes),
+            "window_failures": failures,
+        }
+
+
+class AdmissionController:
+    """Adaptive limiter and circuit breaker in front of one dependency, e.g. IAM token exchange.
+
+    call() fails fast with CircuitOpen or Overloaded (ToolErrors, so MCP clients get a
+    clear message) instead of letting blocked calls pile up, and treats a timeout as a
+    failure. is_failure decides which exceptions count against the dependency.
+    """
+
+    def __init__(self, name: str, limiter: AdaptiveLimiter | None = None,
+                 breaker: CircuitBreaker | None = None, is_failure=server_side_failure):
+        self.name = name
+        self.limiter = limiter or AdaptiveLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.is_failure = is_failure
+
+    async def call(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) under admission control"""
+        if not self.breaker.allow():
+            raise CircuitOpen(
+                f"{self.name} is unavailable, retry in {self.breaker.retry_after():.0f}s"
+            )
+        try:
+            await self.limiter.acquire()
+        except Overloaded:
+            # A probe that was shed must not leave the breaker half-open forever
+            if self.breaker.state == "half_open":
+                self.breaker.cancel_probe()
+            raise
+        start = time.monotonic()
+        ok = True
+        try:
+            return await fn(*args, **kwargs)
+        except asyncio.TimeoutError:
+            ok = False
+            raise Overloaded(f"{self.name} did not respond in time") from None
+        except Exception as e:
+            ok = not self.is_failure(e)
+            raise
+        finally:
+            latency = time.monotonic() - start
+            self.limiter.release(latency, ok)
+            was_open = self.breaker.state != "closed"
+            self.breaker.record(ok)
+            if not was_open and self.breaker.state == "open":
+                logger.warning("Circuit breaker for %s opened after repeated failures", self.name)
+
+    def stats(self) -> dict:
+        return {**self.limiter.stats(), **self.breaker.stats()}
+
+
+class AdmissionGroup:
+    """One AdmissionController per key, e.g. per OCI region, created on first use by factory(key).
+
+    A dependency that fails in one region opens only that region's breaker, and calls to
+    the other regions keep going. At most max_keys controllers are kept; the least
+    recently used one is dropped (with its state) beyond that.
+    """
+
+    def __init__(self, factory, max_keys: int = 64):
+        self.factory = factory
+        self.max_keys = max_keys
+        self._controllers: collections.OrderedDict[str, AdmissionController] = collections.OrderedDict()
+
+    def get(self, key: str) -> AdmissionController:
+        controller = self._controllers.get(key)
+        if controller is None:
+            controller = self._controllers[key] = self.factory(key)
+            if len(self._controllers) > self.max_keys:
+                self._controllers.popitem(last=False)
+        else:
+            self._controllers.move_to_end(key)
+        return controller
+
+    async def call(self, key: str, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) under the admission control for key"""
+        return await self.get(key).call(fn, *args, **kwargs)
+
+    def stats(self) -> dict:
+        return {key: controller.stats() for key, controller in list(self._controllers.items())}
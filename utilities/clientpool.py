@@ -0,0 +1,75 @@
+import threading
+
+from utilities.metrics import STAGE_SECONDS
+from utilities.ttlcache import TTLCache
+
+
+class OCIClientPool:
+    """Reuse OCI service clients per (signer, region, client class).
+
+    Building an OCI client re-parses config and creates a fresh requests session, so
+    constructing one per tool call throws away keep-alive connections. The pool keeps
+    the most recently used clients (LRU, bounded by max_size) and drops every client
+    of a signer once that signer leaves the signer cache. With service_endpoint, every
+    client sends its requests there instead of the region's OCI endpoint.
+    """
+
+    def __init__(self, max_size: int = 256, connections_per_client: int = 10, service_endpoint: str | None = None):
+        self.connections_per_client = connections_per_client
+        self.service_endpoint = service_endpoint
+        self._clients = TTLCache(max_size=max_size, on_evict=self._on_evict)
+        self._by_signer: dict[int, set] = {}
+        # Reentrant: an LRU eviction inside get() calls _on_evict with the lock held
+        self._lock = threading.RLock()
+        self.created = 0
+
+    def get(self, client_class, signer, region: str, **kwargs):
+        """Return a pooled client_class instance for the signer and region, creating it on first use"""
+        key = (id(signer), region, client_class)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if self.service_endpoint:
+                    kwargs.setdefault("service_endpoint", self.service_endpoint)
+                with STAGE_SECONDS.time(stage="client_construction"):
+                    client = client_class(config={'region': region}, signer=signer, **kwargs)
+                    self._tune_session(client)
+                self._by_signer.setdefault(id(signer), set()).add(key)
+                self._clients.set(key, client)
+                self.created += 1
+        return client
+
+    def evict_signer(self, signer) -> int:
+        """Drop all clients created for the signer and return how many were removed"""
+        with self._lock:
+            keys = self._by_signer.pop(id(signer), set())
+        return sum(1 for key in keys if self._clients.delete(key))
+
+    def _tune_session(self, client):
+        session = getattr(getattr(client, "base_client", None), "session", None)
+        if session is not None:
+            # Use the session's own adapter class, the OCI SDK may ship a vendored requests
+            adapter_class = type(session.get_adapter("https://"))
+            adapter = adapter_class(
+                pool_connections=self.connections_per_client,
+                pool_maxsize=self.connections_per_client,
+            )
+            session.mount("https://", adapter)
+
+    def _on_evict(self, key, client):
+        with self._lock:
+            keys = self._by_signer.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    self._by_signer.pop(key[0], None)
+        session = getattr(getattr(client, "base_client", None), "session", None)
+        if session is not None:
+            session.close()
+
+    def stats(self) -> dict:
+        """Return pool size and cache counters"""
+        return {**self._clients.stats(), "created": self.created}
@@ -1,53 +1,229 @@
 from pathlib import Path
-from datetime import datetime, timedelta
-import json
+from datetime import timedelta
+import asyncio
 import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
 
 class DiskCache:
-    def __init__(self, cache_dir: str = "./cache", ttl_hours: int = 24):
+    """Persistent key/value cache stored in sharded SQLite files.
+
+    Keys are spread over a fixed number of shard databases, each with an index on
+    expiry. Writes are transactional, so a crash never leaves a torn entry, and reads
+    go through SQLite's memory-mapped I/O. A background thread deletes expired entries
+    in bulk, and max_bytes bounds the total size of stored values by dropping the
+    entries closest to expiry first. The size is kept in each shard by triggers, so
+    every process sharing cache_dir (e.g. uvicorn workers) enforces the same limit.
+    aget/aset/adelete/aclear run the same operations off the event loop.
+    """
+
+    def __init__(self, cache_dir: str = "./cache", ttl_hours: int = 24, shards: int = 8,
+                 max_bytes: int | None = None, sweep_interval: float = 60,
+                 mmap_bytes: int = 64 * 1024 * 1024):
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Entries can hold credentials: keep the directory and shard files private to this user
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        os.chmod(self.cache_dir, 0o700)
         self.ttl = timedelta(hours=ttl_hours)
-    
-    def _get_cache_path(self, key: str) -> Path:
-        """Generate cache file path from key"""
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.json"
-    
+        self.max_bytes = max_bytes
+        self._shard_max_bytes = max_bytes // shards if max_bytes else None
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._conns = [self._connect(i, mmap_bytes) for i in range(shards)]
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_interval:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(sweep_interval,), name="diskcache-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _connect(self, shard: int, mmap_bytes: int) -> sqlite3.Connection:
+        path = self.cache_dir / f"shard-{shard:02d}.sqlite"
+        # SQLite gives the -wal and -shm files the same mode as the database file
+        path.touch(mode=0o600)
+        os.chmod(path, 0o600)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        # In one transaction, so no other process writes rows before the size triggers exist
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO cache_size VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM cache))")
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache "
+                "BEGIN UPDATE cache_size SET bytes = bytes + NEW.size; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache "
+                "BEGIN UPDATE cache_size SET bytes = bytes - OLD.size; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache "
+                "BEGIN UPDATE cache_size SET bytes = bytes + NEW.size - OLD.size; END"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return conn
+
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT bytes FROM cache_size").fetchone()[0]
+
+    def _shard(self, key: str) -> int:
+        """Pick the shard for a key"""
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % len(self._conns)
+
     def get(self, key: str):
         """Get value from cache if not expired"""
-        cache_path = self._get_cache_path(key)
-        
-        if not cache_path.exists():
-            return None
-        
+        # Expired rows are left for the sweeper
+        return self.get_entry(key)[0]
+
+    def get_entry(self, key: str) -> tuple:
+        """Get (value, expires_at) if not expired, else (None, None)"""
+        shard = self._shard(key)
+        with self._locks[shard]:
+            row = self._conns[shard].execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None, None
         try:
-            with open(cache_path, 'r') as f:
-                data = json.load(f)
-            
-            # Check expiry
-            cached_time = datetime.fromisoformat(data['timestamp'])
-            if datetime.now() - cached_time > self.ttl:
-                cache_path.unlink()  # Delete expired cache
-                return None
-            
-            return data['value']
-        except (json.JSONDecodeError, KeyError, ValueError):
-            return None
-    
-    def set(self, key: str, value):
-        """Store value in cache"""
-        cache_path = self._get_cache_path(key)
-        
-        data = {
-            'timestamp': datetime.now().isoformat(),
-            'value': value
-        }
-        
-        with open(cache_path, 'w') as f:
-            json.dump(data, f)
-    
+            return json.loads(row[0]), row[1]
+        except ValueError:
+            return None, None
+
+    def set(self, key: str, value, ttl: float | None = None):
+        """Store value in cache for ttl seconds (defaults to ttl_hours, math.inf never expires)"""
+        payload = json.dumps(value)
+        size = len(payload)
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl.total_seconds())
+        shard = self._shard(key)
+        conn = self._conns[shard]
+        with self._locks[shard]:
+            # BEGIN IMMEDIATE also serializes writers in other processes, so the size check sees their rows
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert rather than INSERT OR REPLACE, whose implicit delete would skip the size trigger
+                conn.execute(
+                    "INSERT INTO cache (key, value, expires_at, size) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                    "expires_at = excluded.expires_at, size = excluded.size",
+                    (key, payload, expires_at, size),
+                )
+                if self._shard_max_bytes is not None and self._stored_bytes(conn) > self._shard_max_bytes:
+                    self._shrink(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _shrink(self, conn: sqlite3.Connection):
+        """Drop expired entries, then the ones closest to expiry, until the shard fits"""
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        excess = self._stored_bytes(conn) - self._shard_max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        cursor = conn.execute("SELECT key, size FROM cache ORDER BY expires_at")
+        while excess > 0:
+            rows = cursor.fetchmany(64)
+            if not rows:
+                break
+            for key, size in rows:
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+        cursor.close()
+        conn.executemany("DELETE FROM cache WHERE key = ?", keys)
+
+    def delete(self, key: str) -> bool:
+        """Remove value from cache"""
+        shard = self._shard(key)
+        conn = self._conns[shard]
+        with self._locks[shard]:
+            return conn.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount > 0
+
+    def items(self) -> list[tuple]:
+        """Return (key, value, expires_at) for every entry that has not expired"""
+        entries = []
+        now = time.time()
+        for shard, conn in enumerate(self._conns):
+            with self._locks[shard]:
+                rows = conn.execute(
+                    "SELECT key, value, expires_at FROM cache WHERE expires_at > ?", (now,)
+                ).fetchall()
+            for key, value, expires_at in rows:
+                try:
+                    entries.append((key, json.loads(value), expires_at))
+                except ValueError:
+                    continue
+        return entries
+
     def clear(self):
-        """Clear all cache files"""
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
\ No newline at end of file
+        """Clear all cache entries"""
+        for shard, conn in enumerate(self._conns):
+            with self._locks[shard]:
+                conn.execute("DELETE FROM cache")
+
+    def sweep(self) -> int:
+        """Delete all expired entries and return how many were removed"""
+        removed = 0
+        now = time.time()
+        for shard, conn in enumerate(self._conns):
+            with self._locks[shard]:
+                removed += conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+        return removed
+
+    def _sweep_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except sqlite3.Error:
+                pass
+
+    def size_bytes(self) -> int:
+        """Total size of stored values, including those written by other processes"""
+        total = 0
+        for shard, conn in enumerate(self._conns):
+            with self._locks[shard]:
+                total += self._stored_bytes(conn)
+        return total
+
+    def close(self):
+        """Stop the sweeper and close the shard databases"""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        for shard, conn in enumerate(self._conns):
+            with self._locks[shard]:
+                conn.close()
+
+    async def aget(self, key: str):
+        """Async get, runs in a worker thread"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value, ttl: float | None = None):
+        """Async set, runs in a worker thread"""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def adelete(self, key: str) -> bool:
+        """Async delete, runs in a worker thread"""
+        return await asyncio.to_thread(self.delete, key)
+
+    async def aclear(self):
+        """Async clear, runs in a worker thread"""
+        await asyncio.to_thread(self.clear)
@@ -0,0 +1,32 @@
+import base64
+import functools
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+STORAGE_SALT = b"mcp-storage-encryption-key"
+KDF_ITERATIONS = 1_200_000
+
+
+@functools.lru_cache(maxsize=8)
+def storage_fernet(secret: str) -> Fernet:
+    """Fernet for values stored at rest, derived from secret (e.g. JWT_SIGNING_KEY).
+    The key derivation is deliberately slow, so each secret is derived once per process."""
+    if not secret:
+        raise ValueError("An encryption secret is required for persistent storage")
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=STORAGE_SALT, iterations=KDF_ITERATIONS)
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(secret.encode())))
+
+
+def encrypt_text(fernet: Fernet, text: str) -> str:
+    """Encrypt text into a URL-safe token"""
+    return fernet.encrypt(text.encode()).decode()
+
+
+def decrypt_text(fernet: Fernet, token: str) -> str | None:
+    """Decrypt a token from encrypt_text, or None if it was written with another key or in plaintext"""
+    try:
+        return fernet.decrypt(token.encode()).decode()
+    except (InvalidToken, ValueError):
+        return None
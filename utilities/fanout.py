@@ -0,0 +1,36 @@
+import asyncio
+
+
+async def fan_out(items, fn, limit: int = 8, on_result=None) -> dict:
+    """Run the async fn(item) for every item concurrently, at most limit at a time.
+
+    Results are keyed by item as {"ok": True, "result": ...} or {"ok": False, "error": ...},
+    so one failing item does not fail the others. on_result(item, outcome, done, total)
+    is awaited as each item completes, in completion order, to stream partial results.
+    If fan_out is cancelled or on_result raises, calls still running are cancelled.
+    """
+    items = list(dict.fromkeys(items))
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item):
+        async with semaphore:
+            try:
+                return item, {"ok": True, "result": await fn(item)}
+            except Exception as e:
+                return item, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    tasks = [asyncio.create_task(run(item)) for item in items]
+    results = {}
+    try:
+        for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            item, outcome = await next_result
+            results[item] = outcome
+            if on_result is not None:
+                await on_result(item, outcome, done, len(items))
+    finally:
+        # Cancelled (e.g. the client went away) or on_result raised: stop the remaining calls
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return results
@@ -0,0 +1,106 @@
+import time
+
+import httpx
+
+from fastmcp.utilities.logging import get_logger
+from utilities.metrics import UPSTREAM_HTTP_SECONDS
+
+logger = get_logger(__name__)
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Transport handed to each client of an UpstreamPool.
+    Requests go through the pool's connections and are timed per endpoint; closing the
+    client leaves the pool open."""
+
+    def __init__(self, pool: "UpstreamPool"):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._pool._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            # Time to response headers; bodies from the IAM domain are small
+            self._pool._record(request.url.path, status, time.perf_counter() - start)
+
+    async def aclose(self):
+        pass
+
+
+class UpstreamPool:
+    """Long-lived HTTP connection pool for calls to the IAM domain.
+
+    Every client from client() or transport() shares the same keep-alive connections, so
+    repeated discovery, JWKS and token requests reuse an open TLS connection instead of
+    paying a handshake each time. Requests are timed per URL path into
+    mcp_upstream_http_duration_seconds and stats(). HTTP/2 needs the h2 package and is
+    turned off with a warning when it is missing. Call aclose() on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 10.0,
+    ):
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("http2 requested but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        self.timeout = httpx.Timeout(timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=http2)
+        self._client: httpx.AsyncClient | None = None
+        self._endpoints: dict[str, list] = {}  # path -> [requests, errors, total seconds, max seconds]
+        self.closed = False
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Transport for a client created elsewhere, e.g. an authlib OAuth client"""
+        return _PooledTransport(self)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client for plain requests to the IAM domain"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(transport=self.transport(), timeout=self.timeout)
+        return self._client
+
+    def _record(self, path: str, status: str, elapsed: float):
+        UPSTREAM_HTTP_SECONDS.observe(elapsed, endpoint=path, status=status)
+        entry = self._endpoints.get(path)
+        if entry is None:
+            entry = self._endpoints[path] = [0, 0, 0.0, 0.0]
+        entry[0] += 1
+        if status == "error" or status.startswith("5"):
+            entry[1] += 1
+        entry[2] += elapsed
+        entry[3] = max(entry[3], elapsed)
+
+    def stats(self) -> dict:
+        """Return request count, errors and average/max seconds per endpoint path"""
+        return {
+            path: {"requests": count, "errors": errors, "avg": total / count, "max": slowest}
+            for path, (count, errors, total, slowest) in self._endpoints.items()
+        }
+
+    async def aclose(self):
+        """Close the shared client and every pooled connection"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._client is not None:
+            await self._client.aclose()
+        await self._transport.aclose()
@@ -0,0 +1,204 @@
+"""AsyncKeyValue stores for OCIProvider/OIDCProxy client_storage.
+
+The OAuth proxy keeps client registrations and in-flight authorization state in its
+client_storage. These classes implement the key_value.aio AsyncKeyValue protocol
+(get/ttl/put/delete and their *_many batch variants, with per-entry TTL) on top of the
+project's caches, so that state can survive restarts (DiskKeyValue) or be shared by
+replicas (RedisKeyValue). build_client_storage encrypts the disk and Redis stores, since
+they hold the proxy's upstream tokens; entries put with ttl=None never expire.
+"""
+import asyncio
+import json
+import math
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any, SupportsFloat
+
+from utilities.diskcache import DiskCache
+from utilities.encryption import storage_fernet
+from utilities.ttlcache import TTLCache
+
+DEFAULT_COLLECTION = "default"
+
+
+def _remaining(expires_at: float | None) -> float | None:
+    if expires_at is None or math.isinf(expires_at):
+        return None
+    return max(0.0, expires_at - time.time())
+
+
+class MemoryKeyValue:
+    """Bounded in-process store (LRU beyond max_size)"""
+
+    def __init__(self, max_size: int = 10000):
+        self._cache = TTLCache(max_size=max_size)
+
+    async def get(self, key: str, *, collection: str | None = None) -> dict[str, Any] | None:
+        return (await self.ttl(key, collection=collection))[0]
+
+    async def ttl(self, key: str, *, collection: str | None = None) -> tuple[dict[str, Any] | None, float | None]:
+        entry = self._cache.get((collection or DEFAULT_COLLECTION, key))
+        if entry is None:
+            return None, None
+        value, expires_at = entry
+        return dict(value), _remaining(expires_at)
+
+    async def put(self, key: str, value: Mapping[str, Any], *, collection: str | None = None,
+                  ttl: SupportsFloat | None = None) -> None:
+        expires_at = time.time() + float(ttl) if ttl is not None else None
+        self._cache.set((collection or DEFAULT_COLLECTION, key), (dict(value), expires_at), expires_at=expires_at)
+
+    async def delete(self, key: str, *, collection: str | None = None) -> bool:
+        return self._cache.delete((collection or DEFAULT_COLLECTION, key))
+
+    async def get_many(self, keys: list[str], *, collection: str | None = None) -> list[dict[str, Any] | None]:
+        return [entry[0] for entry in await self.ttl_many(keys, collection=collection)]
+
+    async def ttl_many(self, keys: list[str], *, collection: str | None = None) -> list[tuple[dict[str, Any] | None, float | None]]:
+        return [await self.ttl(key, collection=collection) for key in keys]
+
+    async def put_many(self, keys: list[str], values: Sequence[Mapping[str, Any]], *,
+                       collection: str | None = None, ttl: SupportsFloat | None = None) -> None:
+        for key, value in zip(keys, values, strict=True):
+            await self.put(key, value, collection=collection, ttl=ttl)
+
+    async def delete_many(self, keys: list[str], *, collection: str | None = None) -> int:
+        return sum([await self.delete(key, collection=collection) for key in keys])
+
+
+class DiskKeyValue:
+    """Persistent store on the sharded SQLite DiskCache. Batch calls make one thread hop."""
+
+    def __init__(self, cache_dir: str = "./oauthstore", **disk_cache_options):
+        self.disk_cache = DiskCache(cache_dir=cache_dir, **disk_cache_options)
+
+    @staticmethod
+    def _key(key: str, collection: str | None) -> str:
+        return f"{collection or DEFAULT_COLLECTION}::{key}"
+
+    def _ttl_many_sync(self, keys: list[str], collection: str | None):
+        results = []
+        for key in keys:
+            value, expires_at = self.disk_cache.get_entry(self._key(key, collection))
+            results.append((value, _remaining(expires_at) if value is not None else None))
+        return results
+
+    def _put_many_sync(self, keys, values, collection, ttl):
+        for key, value in zip(keys, values, strict=True):
+            self.disk_cache.set(self._key(key, collection), dict(value), ttl=float(ttl) if ttl is not None else math.inf)
+
+    def _delete_many_sync(self, keys, collection) -> int:
+        return sum(1 for key in keys if self.disk_cache.delete(self._key(key, collection)))
+
+    async def get(self, key: str, *, collection: str | None = None) -> dict[str, Any] | None:
+        return (await self.ttl(key, collection=collection))[0]
+
+    async def ttl(self, key: str, *, collection: str | None = None) -> tuple[dict[str, Any] | None, float | None]:
+        return (await self.ttl_many([key], collection=collection))[0]
+
+    async def put(self, key: str, value: Mapping[str, Any], *, collection: str | None = None,
+                  ttl: SupportsFloat | None = None) -> None:
+        await self.put_many([key], [value], collection=collection, ttl=ttl)
+
+    async def delete(self, key: str, *, collection: str | None = None) -> bool:
+        return await self.delete_many([key], collection=collection) > 0
+
+    async def get_many(self, keys: list[str], *, collection: str | None = None) -> list[dict[str, Any] | None]:
+        return [entry[0] for entry in await self.ttl_many(keys, collection=collection)]
+
+    async def ttl_many(self, keys: list[str], *, collection: str | None = None) -> list[tuple[dict[str, Any] | None, float | None]]:
+        return await asyncio.to_thread(self._ttl_many_sync, keys, collection)
+
+    async def put_many(self, keys: list[str], values: Sequence[Mapping[str, Any]], *,
+                       collection: str | None = None, ttl: SupportsFloat | None = None) -> None:
+        await asyncio.to_thread(self._put_many_sync, keys, values, collection, ttl)
+
+    async def delete_many(self, keys: list[str], *, collection: str | None = None) -> int:
+        return await asyncio.to_thread(self._delete_many_sync, keys, collection)
+
+
+class RedisKeyValue:
+    """Store on redis.asyncio using the connection pool shared per Redis URL.
+    Batch calls use MGET, DEL with many keys and pipelines."""
+
+    def __init__(self, redis_url: str = "redis://localhost:6379", key_prefix: str = "mcp:oauth:",
+                 max_connections: int = 50, client=None):
+        from utilities.rediscache import shared_async_client
+
+        self.redis_client = client or shared_async_client(redis_url, max_connections)
+        self.key_prefix = key_prefix
+
+    def _key(self, key: str, collection: str | None) -> str:
+        return f"{self.key_prefix}{collection or DEFAULT_COLLECTION}:{key}"
+
+    async def get(self, key: str, *, collection: str | None = None) -> dict[str, Any] | None:
+        cached = await self.redis_client.get(self._key(key, collection))
+        return json.loads(cached) if cached else None
+
+    async def ttl(self, key: str, *, collection: str | None = None) -> tuple[dict[str, Any] | None, float | None]:
+        return (await self.ttl_many([key], collection=collection))[0]
+
+    async def put(self, key: str, value: Mapping[str, Any], *, collection: str | None = None,
+                  ttl: SupportsFloat | None = None) -> None:
+        await self.redis_client.set(
+            self._key(key, collection), json.dumps(dict(value)), px=int(float(ttl) * 1000) if ttl is not None else None
+        )
+
+    async def delete(self, key: str, *, collection: str | None = None) -> bool:
+        return bool(await self.redis_client.delete(self._key(key, collection)))
+
+    async def get_many(self, keys: list[str], *, collection: str | None = None) -> list[dict[str, Any] | None]:
+        if not keys:
+            return []
+        values = await self.redis_client.mget([self._key(key, collection) for key in keys])
+        return [json.loads(value) if value else None for value in values]
+
+    async def ttl_many(self, keys: list[str], *, collection: str | None = None) -> list[tuple[dict[str, Any] | None, float | None]]:
+        if not keys:
+            return []
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(self._key(key, collection))
+                pipe.pttl(self._key(key, collection))
+            replies = await pipe.execute()
+        results = []
+        for value, pttl in zip(replies[::2], replies[1::2]):
+            if not value:
+                results.append((None, None))
+            else:
+                # PTTL is -1 for keys without expiry
+                results.append((json.loads(value), pttl / 1000 if pttl >= 0 else None))
+        return results
+
+    async def put_many(self, keys: list[str], values: Sequence[Mapping[str, Any]], *,
+                       collection: str | None = None, ttl: SupportsFloat | None = None) -> None:
+        px = int(float(ttl) * 1000) if ttl is not None else None
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in zip(keys, values, strict=True):
+                pipe.set(self._key(key, collection), json.dumps(dict(value)), px=px)
+            await pipe.execute()
+
+    async def delete_many(self, keys: list[str], *, collection: str | None = None) -> int:
+        if not keys:
+            return 0
+        return await self.redis_client.delete(*[self._key(key, collection) for key in keys])
+
+
+def build_client_storage(kind: str | None, *, cache_dir: str = "./oauthstore",
+                         redis_url: str = "redis://localhost:6379", encryption_secret: str | None = None):
+    """Return the client_storage for kind "memory", "disk" or "redis", or None for fastmcp's default.
+
+    Disk and Redis values are Fernet-encrypted with a key derived from encryption_secret;
+    entries that fail to decrypt (another key, older plaintext) read as missing.
+    """
+    if kind == "memory":
+        return MemoryKeyValue()
+    if kind == "disk":
+        store = DiskKeyValue(cache_dir=cache_dir)
+    elif kind == "redis":
+        store = RedisKeyValue(redis_url=redis_url)
+    else:
+        return None
+    from key_value.aio.wrappers.encryption import FernetEncryptionWrapper
+
+    return FernetEncryptionWrapper(store, fernet=storage_fernet(encryption_secret), raise_on_decryption_error=False)
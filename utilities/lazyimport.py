@@ -0,0 +1,32 @@
+import importlib
+
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access.
+
+    The OCI SDK package imports every service client when any part of it is imported,
+    which dominates server startup. Servers bind oci = LazyModule("oci") and keep using
+    oci.identity.IdentityClient etc.; the import happens on first use, or in a warm-up
+    step via load() in a worker thread so the event loop is not blocked.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self):
+        """Import the module if needed and return it"""
+        if self._module is None:
+            # import_module holds the import lock, concurrent first uses import once
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self._name!r} loaded={self.loaded}>"
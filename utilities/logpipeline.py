@@ -0,0 +1,162 @@
+"""Non-blocking, structured logging for the servers and OCIProvider.
+
+configure_logging() routes the "fastmcp" logger tree (which includes every module using
+fastmcp.utilities.logging.get_logger) through a queue: the calling thread only enqueues
+the record, and a QueueListener thread formats and writes it, so no I/O happens on the
+event loop. Messages keep their %-style args until the listener formats them, so a
+disabled or dropped record costs only the level check. Records carry the request ID and
+access token jti set by LogContextMiddleware, and DEBUG/INFO messages are rate-limited
+per message template so hot-path events such as cache hits cannot flood the output.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+request_id_var = contextvars.ContextVar("log_request_id", default=None)
+jti_var = contextvars.ContextVar("log_jti", default=None)
+
+_listener: QueueListener | None = None
+_handler: QueueHandler | None = None
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current request ID and jti to the record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.jti = jti_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most rate records per second through for each DEBUG/INFO message template.
+    WARNING and above are never dropped. Dropped records are counted in suppressed."""
+
+    def __init__(self, rate: float = 10, burst: float | None = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._buckets: dict[tuple, list] = {}  # (logger, msg) -> [tokens, last refill]
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) > 10000:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [self.burst, now]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                self.suppressed += 1
+                return False
+            bucket[0] -= 1
+            return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+    The stock prepare() merges args into the message on the calling thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with timestamp, level, logger, message and correlation IDs"""
+
+    converter = time.gmtime
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        jti = getattr(record, "jti", None)
+        if jti:
+            entry["jti"] = jti
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str | int = "INFO", json_output: bool = True, rate_limit: float = 10,
+                      stream=None, logger_name: str = "fastmcp") -> QueueListener:
+    """Replace the handlers of logger_name with the queue-backed pipeline and start the listener.
+    rate_limit is per message template per second, 0 disables it. Safe to call again."""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if json_output:
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s %(jti)s] %(message)s"
+        ))
+
+    _handler = DeferredQueueHandler(queue.SimpleQueue())
+    _handler.addFilter(ContextFilter())
+    if rate_limit:
+        _handler.addFilter(RateLimitFilter(rate_limit))
+
+    logger = logging.getLogger(logger_name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class LogContextMiddleware(Middleware):
+    """Set the request ID and caller's jti for log records emitted while handling an MCP request"""
+
+    async def on_request(self, context: MiddlewareContext, call_next):
+        try:
+            token = get_access_token()
+        except Exception:
+            token = None
+        request_token = request_id_var.set(uuid.uuid4().hex[:16])
+        jti_token = jti_var.set(token.claims.get("jti") if token is not None else None)
+        try:
+            return await call_next(context)
+        finally:
+            request_id_var.reset(request_token)
+            jti_var.reset(jti_token)
@@ -0,0 +1,240 @@
+"""Prometheus-style metrics for the MCP servers.
+
+Counters, gauges and histograms live in a MetricsRegistry and are rendered in the
+Prometheus text format by render(), which the servers expose on /metrics. Recording
+does not take a lock: updates are single dict operations under the GIL, so a rare lost
+increment under heavy thread contention is traded for near-zero overhead on the hot path.
+"""
+import time
+from contextlib import contextmanager
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labelnames: tuple, labels: dict) -> tuple:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames: tuple, key: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, key)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in list(self._values.items()):
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[_label_key(self.labelnames, labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        """Increment while the block runs"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        for key, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, f'le="{bound}"'), cumulative
+            yield f"{self.name}_bucket", _format_labels(self.labelnames, key, 'le="+Inf"'), series[-1]
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), series[-2]
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), series[-1]
+
+
+class CallbackMetric:
+    """Metric whose values are read from fn() at render time, e.g. cache stats().
+    fn returns a dict mapping a label dict (as tuple of pairs) or () to a value."""
+
+    def __init__(self, name: str, help: str, fn, type: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.type = type
+        self._fn = fn
+
+    def samples(self):
+        for labels, value in self._fn().items():
+            names = tuple(name for name, _ in labels)
+            yield self.name, _format_labels(names, tuple(str(v) for _, v in labels)), value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, fn, type: str = "gauge") -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, fn, type))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            try:
+                for name, labels, value in metric.samples():
+                    lines.append(f"{name}{labels} {value}")
+            except Exception:
+                continue
+        return "\n".join(lines) + "\n"
+
+
+# Registry shared by the servers, OCIProvider and the utilities
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "mcp_stage_duration_seconds",
+    "Time spent per request stage (jwt_validation, token_exchange, client_construction)",
+    ("stage",),
+)
+TOOL_SECONDS = metrics.histogram("mcp_tool_duration_seconds", "Tool call duration", ("tool", "status"))
+TOOLS_IN_FLIGHT = metrics.gauge("mcp_tools_in_flight", "Tool calls currently executing", ("tool",))
+TOKEN_EXCHANGE_ERRORS = metrics.counter("mcp_token_exchange_errors_total", "Failed IAM token exchanges", ("error",))
+OCI_CALL_SECONDS = metrics.histogram(
+    "mcp_oci_call_duration_seconds", "OCI SDK calls run in the executor, split into queue wait and execution", ("call", "phase")
+)
+UPSTREAM_HTTP_SECONDS = metrics.histogram(
+    "mcp_upstream_http_duration_seconds", "IAM domain requests made through OCIProvider's connection pool", ("endpoint", "status")
+)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Record per-tool duration, status and in-flight count"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool = context.message.name
+        status = "ok"
+        start = time.perf_counter()
+        TOOLS_IN_FLIGHT.inc(tool=tool)
+        try:
+            return await call_next(context)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            TOOLS_IN_FLIGHT.dec(tool=tool)
+            TOOL_SECONDS.observe(time.perf_counter() - start, tool=tool, status=status)
+
+
+def cache_stats_callback(caches: dict):
+    """Build a callback exposing hits/misses/evictions/size of named caches with stats().
+    Nested stats such as a tiered cache's {"l1": {...}, "l2": {...}} become fields like l1_hits."""
+
+    def collect():
+        values = {}
+        for cache_name, cache in caches.items():
+            for field, value in _flatten(cache.stats()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values[(("cache", cache_name), ("field", field))] = value
+        return values
+
+    return collect
+
+
+def labelled_stats_callback(fn, *labelnames: str):
+    """Build a callback exposing the numbers in fn()'s nested dict, one label per level.
+    E.g. labelled_stats_callback(pool.stats, "endpoint", "field") renders
+    {"/token": {"requests": 3}} as {endpoint="/token",field="requests"} 3."""
+
+    def collect():
+        values = {}
+        for labels, value in _walk(fn(), labelnames):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[labels] = value
+        return values
+
+    return collect
+
+
+def _walk(stats: dict, labelnames: tuple, labels: tuple = ()):
+    name, rest = labelnames[0], labelnames[1:]
+    for key, value in stats.items():
+        if rest and isinstance(value, dict):
+            yield from _walk(value, rest, labels + ((name, key),))
+        elif not rest:
+            yield labels + ((name, key),), value
+
+
+def _flatten(stats: dict, prefix: str = ""):
+    for field, value in stats.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{field}_")
+        else:
+            yield f"{prefix}{field}", value
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utilities.admission import Overloaded
+from utilities.metrics import OCI_CALL_SECONDS
+
+
+class ExecutorBusy(Overloaded):
+    """Raised when the executor queue is full and a call is rejected"""
+
+
+class OCIExecutor:
+    """Bounded thread pool for running blocking OCI SDK calls from async tools.
+
+    The OCI SDK is synchronous, so calling it inline from an async tool stalls the event
+    loop for every connected client. run() hands the call to a dedicated pool, rejects
+    new calls once max_workers + max_queue calls are pending, and stops waiting after
+    the per-call timeout. Queue wait and execution time are tracked separately.
+    """
+
+    def __init__(self, max_workers: int = 16, max_queue: int = 64, timeout: float | None = 30.0, name: str = "oci"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._measured = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.exec_total = 0.0
+        self.exec_max = 0.0
+
+    async def run(self, fn, *args, run_timeout: float | None = None, **kwargs):
+        """Run fn(*args, **kwargs) in the pool and await its result.
+        run_timeout overrides the executor's timeout; kwargs such as timeout= go to fn."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusy(f"OCI executor is busy ({self._pending} calls pending)")
+            self._pending += 1
+
+        submitted = time.perf_counter()
+        call_name = getattr(fn, "__name__", "call")
+
+        def call():
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(call_name, started - submitted, time.perf_counter() - started)
+
+        try:
+            future = self._pool.submit(call)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._on_done)
+
+        timeout = self.timeout if run_timeout is None else run_timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # The worker thread cannot be interrupted, but a call still queued is dropped
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise
+
+    def _record(self, call_name: str, queue_wait: float, exec_time: float):
+        OCI_CALL_SECONDS.observe(queue_wait, call=call_name, phase="queue")
+        OCI_CALL_SECONDS.observe(exec_time, call=call_name, phase="exec")
+        with self._lock:
+            self._measured += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.exec_total += exec_time
+            self.exec_max = max(self.exec_max, exec_time)
+
+    def _on_done(self, future):
+        with self._lock:
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        self._release()
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """Return call counters and queue wait vs execution timings in seconds"""
+        with self._lock:
+            measured = self._measured
+            return {
+                "pending": self._pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "queue_wait_avg": self.queue_wait_total / measured if measured else 0.0,
+                "queue_wait_max": self.queue_wait_max,
+                "exec_avg": self.exec_total / measured if measured else 0.0,
+                "exec_max": self.exec_max,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the worker threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
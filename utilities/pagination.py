@@ -0,0 +1,43 @@
+import datetime
+
+# Upper bound for the limit argument of list tools; OCI list calls accept up to 1000 per page
+MAX_LIMIT = 1000
+
+
+def compact(item, fields: tuple) -> dict:
+    """Turn an OCI SDK model into a small dict holding only the given fields, skipping None"""
+    record = {}
+    for field in fields:
+        value = getattr(item, field, None)
+        if value is None:
+            continue
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+        record[field] = value
+    return record
+
+
+async def list_page(call, list_fn, *args, fields: tuple, cursor: str | None = None, limit: int = 100,
+                    ctx=None, **kwargs) -> dict:
+    """Return up to limit records of a paginated OCI list call, starting at cursor.
+
+    call runs the blocking SDK call, e.g. the servers' _call_oci bound to a region.
+    Pages are requested with the remaining count as their limit, so the returned
+    next_cursor (OCI's opc-next-page token, or None at the end) continues exactly after
+    the last record.
+    Each SDK response is reduced to compact records before the next page is fetched, so
+    memory is bounded by limit whatever the size of the full listing. With a FastMCP
+    Context, progress is reported after every page.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    items = []
+    page = cursor
+    while len(items) < limit:
+        response = await call(list_fn, *args, page=page, limit=limit - len(items), **kwargs)
+        items.extend(compact(item, fields) for item in response.data)
+        page = response.next_page if response.has_next_page else None
+        if ctx is not None:
+            await ctx.report_progress(len(items), limit)
+        if page is None:
+            break
+    return {"items": items, "count": len(items), "next_cursor": page}
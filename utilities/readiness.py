@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Readiness:
+    """Run startup warm-up steps and report when the replica is ready for traffic.
+
+    Steps are named async callables registered with add_step(); start() runs them all
+    concurrently in the background so liveness checks are answered while they run. A
+    step is done when it returns without raising and its result is not False. Failed
+    steps are retried by check() at most once every retry_interval seconds, so a
+    replica that started during an IAM outage becomes ready once IAM is back.
+    """
+
+    def __init__(self, retry_interval: float = 10, step_timeout: float = 30):
+        self.retry_interval = retry_interval
+        self.step_timeout = step_timeout
+        self._steps: dict = {}
+        self._status: dict[str, dict] = {}
+        self._task: asyncio.Task | None = None
+        self._last_run = 0.0
+
+    def add_step(self, name: str, fn):
+        """Register an async warm-up step"""
+        self._steps[name] = fn
+        self._status[name] = {"done": False}
+
+    @property
+    def ready(self) -> bool:
+        return all(status["done"] for status in self._status.values())
+
+    async def _run_step(self, name: str, fn):
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(fn(), self.step_timeout)
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", name, e)
+            self._status[name] = {"done": False, "error": f"{type(e).__name__}: {e}"}
+            return
+        self._status[name] = {
+            "done": result is not False,
+            "seconds": round(time.perf_counter() - started, 3),
+            "result": result if isinstance(result, (int, float, bool)) else None,
+        }
+        logger.info("Warm-up step %s finished in %.3fs", name, self._status[name]["seconds"])
+
+    async def _run_pending(self):
+        self._last_run = time.monotonic()
+        pending = [(name, fn) for name, fn in self._steps.items() if not self._status[name]["done"]]
+        await asyncio.gather(*(self._run_step(name, fn) for name, fn in pending))
+
+    def start(self):
+        """Run the warm-up in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_pending())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def check(self) -> tuple[bool, dict]:
+        """Return (ready, per-step status), retrying failed steps in the background"""
+        ready = self.ready
+        if not ready and (self._task is None or self._task.done()) \
+                and time.monotonic() - self._last_run >= self.retry_interval:
+            self.start()
+        return ready, dict(self._status)
+
+
+async def prefetch_jwks(verifier) -> bool:
+    """Load the token verifier's signing keys so the first request does not fetch them.
+    A missing verifier, or one without a known way to prefetch, has nothing to prefetch."""
+    if hasattr(verifier, "warm_up"):
+        return await verifier.warm_up()
+    get_jwks_key = getattr(verifier, "_get_jwks_key", None)
+    if get_jwks_key is None:
+        logger.info("Token verifier %s has no JWKS to prefetch", type(verifier).__name__)
+        return True
+    try:
+        await get_jwks_key(None)
+    except ValueError as e:
+        # fastmcp's JWTVerifier caches the whole JWKS on lookup; with several keys and no kid
+        # it raises after caching them. Any other failure (IAM unreachable, empty JWKS) leaves
+        # the cache empty and the step is retried.
+        if not getattr(verifier, "_jwks_cache", None):
+            logger.warning("JWKS prefetch failed: %s", e)
+            return False
+    return True
@@ -1,27 +1,153 @@
+import json
+import time
+from typing import TYPE_CHECKING
+
 import redis
-from datetime import timedelta
-from oci.auth.signers import TokenExchangeSigner
+import redis.asyncio as aioredis
+
+from utilities.encryption import decrypt_text, encrypt_text
+from utilities.upst import dump_signer, load_signer, signer_expiry
+
+if TYPE_CHECKING:
+    # Only for annotations; importing the OCI SDK at module load costs seconds
+    from oci.auth.signers import TokenExchangeSigner
+
+KEY_PREFIX = "mcp:token:"
+
+# Connection pools shared by every async cache pointing at the same Redis URL
+_async_pools: dict[str, aioredis.ConnectionPool] = {}
+
+
+def shared_async_client(redis_url: str, max_connections: int = 50) -> aioredis.Redis:
+    """redis.asyncio client on the connection pool shared by everything using redis_url"""
+    pool = _async_pools.get(redis_url)
+    if pool is None:
+        pool = aioredis.ConnectionPool.from_url(redis_url, max_connections=max_connections)
+        _async_pools[redis_url] = pool
+    return aioredis.Redis(connection_pool=pool)
+
+
+def _ttl_seconds(data: dict, expires_at: float | None, default_ttl: float) -> int:
+    """Remaining lifetime of the token, capped by expires_at"""
+    deadlines = [d for d in (data.get("exp"), expires_at) if d is not None]
+    if not deadlines:
+        return int(default_ttl)
+    return int(min(deadlines) - time.time())
+
+
+def _dumps(data: dict, fernet) -> str:
+    """Serialize dump_signer output, encrypted when a Fernet is given"""
+    payload = json.dumps(data)
+    return encrypt_text(fernet, payload) if fernet is not None else payload
+
+
+def _loads(cached, fernet):
+    """Rebuild a signer from a stored value, or None if it is missing, expired or fails to decrypt"""
+    if not cached:
+        return None
+    payload = cached.decode() if isinstance(cached, bytes) else cached
+    if fernet is not None:
+        payload = decrypt_text(fernet, payload)
+        if payload is None:
+            return None
+    return load_signer(json.loads(payload))
+
 
 class RedisTokenCache:
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self, redis_url: str = "redis://localhost:6379", fernet=None):
         self.redis_client = redis.from_url(redis_url)
-        
-    def set(self, tokenID: str, signer: TokenExchangeSigner, ttl_hours: int = 24):
+        self.fernet = fernet
+
+    def set(self, tokenID: str, signer: "TokenExchangeSigner", ttl_hours: int = 24):
         """Store signer in Redis with TTL"""
 
-        cache_key = f"mcp:token:{tokenID}"
-        # Store in Redis with TTL
-        self.redis_client.setex(
-            cache_key,
-            timedelta(hours=ttl_hours),
-            signer
-        )
-    
+        cache_key = f"{KEY_PREFIX}{tokenID}"
+        # Redis cannot store the signer object, store its UPST and session key instead.
+        # The TTL never outlives the UPST.
+        data = dump_signer(signer)
+        ttl = _ttl_seconds(data, None, ttl_hours * 3600)
+        if ttl <= 0:
+            return
+        self.redis_client.setex(cache_key, ttl, _dumps(data, self.fernet))
+
     def get(self, tokenID: str):
         """Retrieve signer from Redis"""
-        cache_key = f"mcp:token:{tokenID}"
-        cached = self.redis_client.get(cache_key)
+        cache_key = f"{KEY_PREFIX}{tokenID}"
+        return _loads(self.redis_client.get(cache_key), self.fernet)
+
+
+class AsyncRedisTokenCache:
+    """redis.asyncio based signer cache that does not block the event loop.
+
+    Stores the exchanged UPST, its session key and expiry (see utilities.upst) so that
+    replicas behind a load balancer can share exchanged tokens. Entries use the token's
+    remaining lifetime as TTL. Batch reads and writes go through MGET and pipelines.
+    With a Fernet (utilities.encryption.storage_fernet), values are encrypted in Redis.
+    """
+
+    def __init__(self, redis_url: str = "redis://localhost:6379", max_connections: int = 50,
+                 default_ttl: float = 3600, client: aioredis.Redis | None = None, fernet=None):
+        self.redis_client = client or shared_async_client(redis_url, max_connections)
+        self.default_ttl = default_ttl
+        self.fernet = fernet
+
+    async def set(self, tokenID: str, signer, expires_at: float | None = None):
+        """Store signer until its UPST (or expires_at, if earlier) expires"""
+        data = dump_signer(signer)
+        ttl = _ttl_seconds(data, expires_at, self.default_ttl)
+        if ttl > 0:
+            await self.redis_client.set(f"{KEY_PREFIX}{tokenID}", _dumps(data, self.fernet), ex=ttl)
+
+    async def get(self, tokenID: str):
+        """Retrieve signer from Redis, or None"""
+        return _loads(await self.redis_client.get(f"{KEY_PREFIX}{tokenID}"), self.fernet)
+
+    async def delete(self, tokenID: str) -> bool:
+        """Remove a signer from Redis"""
+        return bool(await self.redis_client.delete(f"{KEY_PREFIX}{tokenID}"))
+
+    async def get_many(self, tokenIDs: list[str]) -> dict:
+        """Retrieve several signers with a single MGET; missing or expired ones are left out"""
+        if not tokenIDs:
+            return {}
+        values = await self.redis_client.mget([f"{KEY_PREFIX}{tokenID}" for tokenID in tokenIDs])
+        signers = {}
+        for tokenID, cached in zip(tokenIDs, values):
+            signer = _loads(cached, self.fernet)
+            if signer is not None:
+                signers[tokenID] = signer
+        return signers
+
+    async def set_many(self, signers: dict):
+        """Store several signers in one pipelined round trip"""
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for tokenID, signer in signers.items():
+                data = dump_signer(signer)
+                ttl = _ttl_seconds(data, None, self.default_ttl)
+                if ttl > 0:
+                    pipe.set(f"{KEY_PREFIX}{tokenID}", _dumps(data, self.fernet), ex=ttl)
+            await pipe.execute()
+
+    async def warmup(self, cache, batch_size: int = 500) -> int:
+        """Load every stored signer into an in-process TTLCache and return how many were loaded"""
+        loaded = 0
+        batch = []
+        async for key in self.redis_client.scan_iter(match=f"{KEY_PREFIX}*", count=batch_size):
+            batch.append(key.decode() if isinstance(key, bytes) else key)
+            if len(batch) >= batch_size:
+                loaded += await self._warm_batch(cache, batch)
+                batch = []
+        if batch:
+            loaded += await self._warm_batch(cache, batch)
+        return loaded
+
+    async def _warm_batch(self, cache, keys: list[str]) -> int:
+        tokenIDs = [key[len(KEY_PREFIX):] for key in keys]
+        signers = await self.get_many(tokenIDs)
+        for tokenID, signer in signers.items():
+            cache.set(tokenID, signer, expires_at=signer_expiry(signer))
+        return len(signers)
 
-        if cached:
-            return cached
-        return None
\ No newline at end of file
+    async def aclose(self):
+        """Release this client's connections back to the shared pool"""
+        await self.redis_client.aclose()
@@ -0,0 +1,133 @@
+import asyncio
+import contextvars
+import copy
+import functools
+import inspect
+import json
+import time
+from contextlib import contextmanager
+
+from fastmcp import Context
+from fastmcp.server.dependencies import get_access_token
+
+from utilities.ttlcache import TTLCache
+
+_bypass = contextvars.ContextVar("response_cache_bypass", default=False)
+
+
+def principal_scope(claims: dict) -> str:
+    """Cache scope for a single user"""
+    return f"principal:{claims.get('iss')}:{claims.get('sub')}"
+
+
+def tenancy_scope(claims: dict) -> str:
+    """Cache scope shared by users of the same tenant, falling back to the user"""
+    tenant = claims.get("tenant")
+    if not tenant:
+        return principal_scope(claims)
+    return f"tenancy:{claims.get('iss')}:{tenant}"
+
+
+SCOPES = {"principal": principal_scope, "tenancy": tenancy_scope}
+
+
+class ResponseCache:
+    """Cache results of idempotent, read-only MCP tools.
+
+    Entries are keyed on the tool name, its arguments (Context excluded) and a scope
+    derived from the caller's access token claims, so one tenant's result is never
+    served to another. Each tool sets its own TTL; with stale_ttl, an expired entry
+    is still served for that many extra seconds while it is refreshed in the background.
+    Values are copied in and out, so callers may mutate what they get back.
+
+    Usage, below @mcp.tool:
+        @mcp.tool
+        @response_cache.cached(ttl=86400, scope="tenancy")
+        async def get_os_namespace(region: str, ctx: Context) -> str: ...
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self._entries = TTLCache(max_size=max_size)
+        self._refreshing: set = set()
+        # Event loop holds only weak references to tasks, keep background refreshes alive
+        self._tasks: set[asyncio.Task] = set()
+        self.stale_hits = 0
+
+    def cached(self, ttl: float, scope: str = "principal", stale_ttl: float = 0):
+        """Decorator caching an async tool's result for ttl seconds per scope"""
+        scope_fn = SCOPES[scope]
+
+        def decorator(fn):
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if _bypass.get():
+                    return await fn(*args, **kwargs)
+                key = self._key(fn.__name__, scope_fn(get_access_token().claims), signature, args, kwargs)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    value, fresh_until = entry
+                    if fresh_until > time.time():
+                        return copy.deepcopy(value)
+                    # Stale but within stale_ttl: serve it and refresh in the background
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        task = asyncio.create_task(self._refresh(key, fn, args, kwargs, ttl, stale_ttl))
+                        self._tasks.add(task)
+                        task.add_done_callback(self._tasks.discard)
+                    return copy.deepcopy(value)
+                value = await fn(*args, **kwargs)
+                self._store(key, value, ttl, stale_ttl)
+                return value
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def _key(name: str, scope_key: str, signature, args, kwargs) -> tuple:
+        bound = signature.bind_partial(*args, **kwargs)
+        arguments = {k: v for k, v in bound.arguments.items() if not isinstance(v, Context)}
+        return (name, scope_key, json.dumps(arguments, sort_keys=True, default=str))
+
+    def _store(self, key, value, ttl: float, stale_ttl: float):
+        now = time.time()
+        self._entries.set(key, (copy.deepcopy(value), now + ttl), expires_at=now + ttl + stale_ttl)
+
+    async def _refresh(self, key, fn, args, kwargs, ttl: float, stale_ttl: float):
+        try:
+            self._store(key, await fn(*args, **kwargs), ttl, stale_ttl)
+        except Exception:
+            # Keep serving the stale value until it expires
+            pass
+        finally:
+            self._refreshing.discard(key)
+
+    def invalidate(self, tool: str | None = None, scope_key: str | None = None) -> int:
+        """Drop cached results, optionally only for one tool and/or scope. Returns the count removed."""
+        keys = [
+            key for key in self._entries.keys()
+            if (tool is None or key[0] == tool) and (scope_key is None or key[1] == scope_key)
+        ]
+        return sum(1 for key in keys if self._entries.delete(key))
+
+    def invalidate_caller(self, tool: str | None = None) -> int:
+        """Drop the calling user's cached results (both principal and tenancy scopes)"""
+        claims = get_access_token().claims
+        return sum(self.invalidate(tool, scope_fn(claims)) for scope_fn in SCOPES.values())
+
+    @staticmethod
+    @contextmanager
+    def bypass():
+        """Skip the cache for tool calls made inside this block"""
+        token = _bypass.set(True)
+        try:
+            yield
+        finally:
+            _bypass.reset(token)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        return {**self._entries.stats(), "stale_hits": self.stale_hits}
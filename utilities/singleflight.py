@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key runs the function; callers that arrive while it is
+    in flight wait for the same result (or exception) instead of running it again.
+    Works across threads (do) and on the event loop (do_async), and both kinds of
+    callers can share one in-flight call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.executions = 0
+        self.deduplicated = 0
+
+    def _join_or_lead(self, key) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.executions += 1
+            return future, True
+
+    def _finish(self, key, future: Future, result=None, error: BaseException | None = None):
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) once for all concurrent callers with the same key"""
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def do_async(self, key, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) once for all concurrent callers with the same key.
+        fn may be a coroutine function or a plain callable. The call runs in its own
+        task, so a caller that is cancelled (e.g. its client disconnected) stops waiting
+        without cancelling the call for the others."""
+        future, leader = self._join_or_lead(key)
+        if leader:
+            task = asyncio.ensure_future(self._run_async(key, future, fn, args, kwargs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def _run_async(self, key, future: Future, fn, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = await result
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        self._finish(key, future, result=result)
+
+    def stats(self) -> dict:
+        """Return how many calls ran and how many were served from an in-flight call"""
+        return {
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import time
+
+from fastmcp.utilities.logging import get_logger
+
+from utilities.encryption import decrypt_text, encrypt_text
+from utilities.upst import dump_signer, load_signer, signer_expiry
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "mcp:token:invalidate"
+
+
+class DiskSignerStore:
+    """Async L2 signer store on top of DiskCache, for replicas sharing a volume.
+    With a Fernet (utilities.encryption.storage_fernet), the UPST and session key are
+    encrypted on disk and entries that fail to decrypt read as missing."""
+
+    def __init__(self, disk_cache, fernet=None):
+        self.disk_cache = disk_cache
+        self.fernet = fernet
+
+    def _load(self, stored):
+        if stored and self.fernet is not None:
+            plaintext = decrypt_text(self.fernet, stored) if isinstance(stored, str) else None
+            stored = json.loads(plaintext) if plaintext else None
+        return load_signer(stored) if stored else None
+
+    async def get(self, tokenID: str):
+        return self._load(await self.disk_cache.aget(tokenID))
+
+    async def set(self, tokenID: str, signer, expires_at: float | None = None):
+        data = dump_signer(signer)
+        deadlines = [d for d in (data.get("exp"), expires_at) if d is not None]
+        ttl = min(deadlines) - time.time() if deadlines else None
+        if ttl is None or ttl > 0:
+            stored = encrypt_text(self.fernet, json.dumps(data)) if self.fernet is not None else data
+            await self.disk_cache.aset(tokenID, stored, ttl=ttl)
+
+    async def delete(self, tokenID: str) -> bool:
+        return await self.disk_cache.adelete(tokenID)
+
+    async def warmup(self, cache) -> int:
+        """Load every stored signer into an in-process TTLCache and return how many were loaded"""
+        loaded = 0
+        for tokenID, stored, _ in await asyncio.to_thread(self.disk_cache.items):
+            signer = self._load(stored)
+            if signer is not None:
+                cache.set(tokenID, signer, expires_at=signer_expiry(signer))
+                loaded += 1
+        return loaded
+
+
+class TieredSignerCache:
+    """In-process L1 (TTLCache) in front of an optional shared L2 signer store.
+
+    Lookups hit L1 first and never leave the process on a hit. L2 hits are copied back
+    into L1, and set() writes through to both tiers. L2 is any store with async
+    get/set/delete, e.g. AsyncRedisTokenCache or DiskSignerStore; with l2=None this is
+    just the L1 cache.
+
+    When a redis.asyncio client is given, invalidate() publishes the token ID and every
+    replica running start() drops it from its L1. The listener resubscribes with backoff
+    (reconnect_delay doubling up to max_reconnect_delay) when the Redis connection drops;
+    invalidations published while it is disconnected are missed. Tests can pass a
+    fakeredis client.
+    """
+
+    def __init__(self, l1, l2=None, redis_client=None, channel: str = INVALIDATION_CHANNEL,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.l1 = l1
+        self.l2 = l2
+        self.redis_client = redis_client
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._listener: asyncio.Task | None = None
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.invalidations_received = 0
+        self.reconnects = 0
+
+    async def get(self, tokenID: str):
+        """Return the signer from L1, falling back to L2 and backfilling L1"""
+        signer = self.l1.get(tokenID)
+        if signer is not None:
+            return signer
+        return await self.get_l2(tokenID)
+
+    async def get_l2(self, tokenID: str):
+        """Look up L2 only, backfilling L1 on a hit. For callers that already missed L1."""
+        if self.l2 is None:
+            return None
+        try:
+            signer = await self.l2.get(tokenID)
+        except Exception as e:
+            logger.warning("L2 signer lookup failed for token ID %s: %s", tokenID, e)
+            signer = None
+        if signer is None:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        self.l1.set(tokenID, signer, expires_at=signer_expiry(signer))
+        return signer
+
+    async def set(self, tokenID: str, signer, expires_at: float | None = None):
+        """Write the signer to L1 and through to L2"""
+        self.l1.set(tokenID, signer, expires_at=expires_at)
+        if self.l2 is not None:
+            try:
+                await self.l2.set(tokenID, signer, expires_at=expires_at)
+            except Exception as e:
+                logger.warning("L2 signer write failed for token ID %s: %s", tokenID, e)
+
+    async def invalidate(self, tokenID: str):
+        """Drop a signer everywhere, e.g. on logout or token revocation.
+        Best effort: L2 and publish failures are logged, the local L1 entry is always dropped."""
+        self.l1.delete(tokenID)
+        if self.l2 is not None:
+            try:
+                await self.l2.delete(tokenID)
+            except Exception as e:
+                logger.warning("L2 signer delete failed for token ID %s: %s", tokenID, e)
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.publish(self.channel, json.dumps({"jti": tokenID}))
+            except Exception as e:
+                logger.warning("Publishing the invalidation of token ID %s failed: %s", tokenID, e)
+
+    async def warm_up(self) -> int:
+        """Preload L1 with the signers persisted in L2, e.g. after a restart"""
+        if self.l2 is None or not hasattr(self.l2, "warmup"):
+            return 0
+        loaded = await self.l2.warmup(self.l1)
+        logger.info("Loaded %d signers from L2", loaded)
+        return loaded
+
+    async def start(self):
+        """Subscribe to invalidations published by other replicas"""
+        if self.redis_client is None or self._listener is not None:
+            return
+        pubsub = None
+        try:
+            pubsub = await self._subscribe()
+        except Exception as e:
+            logger.warning("Subscribing to signer invalidations failed, retrying in the background: %s", e)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _subscribe(self):
+        pubsub = self.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+        except BaseException:
+            await _close_pubsub(pubsub)
+            raise
+        return pubsub
+
+    async def _listen(self, pubsub):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = await self._subscribe()
+                    self.reconnects += 1
+                    logger.info("Resubscribed to signer invalidations")
+                delay = self.reconnect_delay
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        tokenID = json.loads(message["data"])["jti"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    self.invalidations_received += 1
+                    self.l1.delete(tokenID)
+                raise ConnectionError("subscription ended")
+            except Exception as e:
+                logger.warning("Signer invalidation listener disconnected, retrying in %.1fs: %s", delay, e)
+            finally:
+                if pubsub is not None:
+                    await _close_pubsub(pubsub)
+                    pubsub = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def stop(self):
+        """Stop listening for invalidations"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> dict:
+        """Return per-tier hit rates"""
+        l1 = self.l1.stats()
+        l1_lookups = l1["hits"] + l1["misses"]
+        l2_lookups = self.l2_hits + self.l2_misses
+        return {
+            "l1": {**l1, "hit_rate": l1["hits"] / l1_lookups if l1_lookups else 0.0},
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "hit_rate": self.l2_hits / l2_lookups if l2_lookups else 0.0,
+            },
+            "invalidations_received": self.invalidations_received,
+            "reconnects": self.reconnects,
+        }
+
+
+async def _close_pubsub(pubsub):
+    try:
+        await pubsub.aclose()
+    except Exception:
+        # The connection is usually already gone
+        pass
@@ -0,0 +1,131 @@
+import asyncio
+import random
+import time
+
+from fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenRefresher:
+    """Re-exchange UPST tokens in the background shortly before they expire.
+
+    Signers are tracked by token ID along with the IAM access token needed to exchange
+    again, the access token's exp and the UPST's exp. Every interval, tokens whose UPST
+    expires within lead_time are refreshed, provided the session was used within
+    idle_timeout and the access token is still valid. Refreshes start with a random
+    delay of up to jitter seconds and at most max_concurrency run at once, so IAM is
+    not flooded when many tokens were issued together.
+
+    refresh is an async callable(token, tokenID, token_exp) returning the new signer.
+    """
+
+    def __init__(self, refresh, signer_expiry, lead_time: float = 300, interval: float = 30,
+                 max_concurrency: int = 4, jitter: float = 30, idle_timeout: float = 900):
+        self._refresh = refresh
+        self._signer_expiry = signer_expiry
+        self.lead_time = lead_time
+        self.interval = interval
+        self.jitter = jitter
+        self.idle_timeout = idle_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._entries: dict[str, dict] = {}
+        self._in_progress: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self.refreshed = 0
+        self.failed = 0
+
+    def track(self, tokenID: str, token: str, token_exp: float | None, signer):
+        """Start (or update) tracking a freshly exchanged signer.
+        Tokens without exp are not tracked, there is no telling when they stop being exchangeable."""
+        if token_exp is None:
+            return
+        self._entries[tokenID] = {
+            "token": token,
+            "token_exp": token_exp,
+            "signer_exp": self._signer_expiry(signer),
+            "last_used": time.time(),
+        }
+
+    def touch(self, tokenID: str):
+        """Mark the session as active"""
+        entry = self._entries.get(tokenID)
+        if entry is not None:
+            entry["last_used"] = time.time()
+
+    def forget(self, tokenID: str):
+        """Stop tracking a token, e.g. when its signer is evicted or invalidated"""
+        self._entries.pop(tokenID, None)
+
+    def _due(self, now: float) -> list[str]:
+        due = []
+        for tokenID, entry in list(self._entries.items()):
+            token_exp = entry["token_exp"]
+            if token_exp is None or token_exp <= now:
+                # The access token can no longer be exchanged
+                self._entries.pop(tokenID, None)
+                continue
+            if now - entry["last_used"] > self.idle_timeout:
+                continue
+            signer_exp = entry["signer_exp"]
+            if signer_exp is None or signer_exp - now > self.lead_time:
+                continue
+            if tokenID not in self._in_progress:
+                due.append(tokenID)
+        return due
+
+    async def _refresh_one(self, tokenID: str):
+        self._in_progress.add(tokenID)
+        try:
+            await asyncio.sleep(random.uniform(0, self.jitter))
+            async with self._semaphore:
+                entry = self._entries.get(tokenID)
+                if entry is None:
+                    return
+                signer = await self._refresh(entry["token"], tokenID, entry["token_exp"])
+                entry["signer_exp"] = self._signer_expiry(signer)
+                self.refreshed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning("Background token refresh failed for token ID %s: %s", tokenID, e)
+        finally:
+            self._in_progress.discard(tokenID)
+
+    async def run_once(self) -> int:
+        """Refresh every token that is due and return how many were attempted"""
+        due = self._due(time.time())
+        if due:
+            await asyncio.gather(*(self._refresh_one(tokenID) for tokenID in due))
+        return len(due)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning("Background token refresh pass failed: %s", e)
+
+    async def start(self):
+        """Start the background refresh loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        """Return tracked/refreshed/failed counts"""
+        return {
+            "tracked": len(self._entries),
+            "in_progress": len(self._in_progress),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+        }
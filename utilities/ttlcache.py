@@ -0,0 +1,124 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded in-memory cache with LRU eviction and per-entry expiry.
+
+    Used by the MCP servers to keep OCI signers keyed by the access token's jti.
+    Each entry expires at an absolute epoch time (normally the token's exp claim),
+    and the least recently used entry is evicted once max_size is reached.
+    get/set/delete are O(1).
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl: float | None = None, on_evict=None):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._on_evict = [on_evict] if on_evict else []
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def add_evict_listener(self, listener):
+        """Register a callable(key, value) invoked when an entry leaves the cache"""
+        self._on_evict.append(listener)
+
+    def _notify(self, removed):
+        for key, value in removed:
+            for listener in self._on_evict:
+                listener(key, value)
+
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired"""
+        removed = []
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                removed.append((key, value))
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        self._notify(removed)
+        return default
+
+    def set(self, key, value, expires_at: float | None = None):
+        """Store value until expires_at (epoch seconds), evicting the LRU entry if full"""
+        if expires_at is None and self.default_ttl is not None:
+            expires_at = time.time() + self.default_ttl
+        removed = []
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None and previous[0] is not value:
+                removed.append((key, previous[0]))
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.max_size:
+                old_key, (old_value, _) = self._data.popitem(last=False)
+                removed.append((old_key, old_value))
+                self.evictions += 1
+        self._notify(removed)
+
+    def delete(self, key) -> bool:
+        """Remove an entry, returning True if it was present"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._notify([(key, entry[0])])
+        return True
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry and return how many were removed"""
+        now = time.time()
+        removed = []
+        with self._lock:
+            for key, (value, expires_at) in list(self._data.items()):
+                if expires_at is not None and expires_at <= now:
+                    del self._data[key]
+                    removed.append((key, value))
+            self.expirations += len(removed)
+        self._notify(removed)
+        return len(removed)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            removed = [(key, value) for key, (value, _) in self._data.items()]
+            self._data.clear()
+        self._notify(removed)
+
+    def keys(self) -> list:
+        """Snapshot of the current keys, including expired entries not yet purged"""
+        with self._lock:
+            return list(self._data)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current size"""
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.time())
@@ -0,0 +1,71 @@
+import base64
+import json
+import time
+
+from cryptography.hazmat.primitives import serialization
+
+SECURITY_TOKEN_PREFIX = "ST$"
+
+
+def jwt_claims(token: str) -> dict:
+    """Decode the claims of a JWT without verifying it.
+    Only use this on tokens that were already verified or issued to us by OCI."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return {}
+
+
+def signer_expiry(signer) -> float | None:
+    """Return the exp claim of the UPST held by an OCI security token signer"""
+    token = _security_token(signer)
+    return jwt_claims(token).get("exp") if token else None
+
+
+def signer_claims(signer) -> dict:
+    """Return the (unverified) claims of the UPST held by a signer, e.g. tenant"""
+    token = _security_token(signer)
+    return jwt_claims(token) if token else {}
+
+
+def dump_signer(signer) -> dict:
+    """Serialize a signer as its UPST, session private key (PEM) and expiry.
+
+    The UPST is bound to the session key pair generated during the token exchange, so
+    both are needed to sign requests. Treat the result as a credential.
+    """
+    token = _security_token(signer)
+    if not token:
+        raise ValueError("signer does not hold an OCI security token")
+    private_key = signer.private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    return {
+        "token": token,
+        "private_key": private_key.decode(),
+        "exp": jwt_claims(token).get("exp"),
+    }
+
+
+def load_signer(data: dict):
+    """Rebuild a signer from dump_signer output, or None if the UPST has expired.
+    The returned signer cannot refresh itself; it is valid until the UPST expires."""
+    exp = data.get("exp")
+    if exp is not None and exp <= time.time():
+        return None
+    # Imported here so that importing this module does not load the whole OCI SDK
+    from oci.auth.signers import SecurityTokenSigner
+
+    private_key = serialization.load_pem_private_key(data["private_key"].encode(), password=None)
+    return SecurityTokenSigner(data["token"], private_key)
+
+
+def _security_token(signer) -> str | None:
+    api_key = getattr(signer, "api_key", None) or ""
+    if api_key.startswith(SECURITY_TOKEN_PREFIX):
+        return api_key[len(SECURITY_TOKEN_PREFIX):]
+    return None